@@ -1,15 +1,25 @@
 """FastAPI application for SGGS API."""
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from datetime import date
+from typing import Literal
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import uvicorn
 
+from paathguide.config import settings
+from paathguide.corpus import corpus_cache
 from paathguide.data_loader import SGGSDataLoader, load_sample_data
 from paathguide.db import schemas
-from paathguide.db.models import create_tables, get_db
-from paathguide.fuzzy_search import SGGSFuzzySearcher
-from paathguide.db.repository import VerseRepository
+from paathguide.db.models import SessionLocal, create_tables, get_async_db, get_db, get_read_only_db
+from paathguide.db.pagination import InvalidCursor
+from paathguide.db.repository import AsyncVerseRepository, VerseRepository
+from paathguide.fuzzy_search import follow_sessions
+from paathguide.result_cache import query_result_cache
+from paathguide.search_service import SearchQueueFull, search_service
+from paathguide.text_cleaner import WhisperTextCleaner, cleaning_stats
 
 # Create FastAPI app
 app = FastAPI(
@@ -34,6 +44,27 @@ def startup_event():
     create_tables()
     print("Database tables created")
 
+    # Build (and normalize) the shared fuzzy-search corpus once and hand it to the search workers
+    db = SessionLocal()
+    try:
+        search_service.start(db)
+        print(f"Fuzzy search corpus loaded ({len(corpus_cache.get(db))} verses, {search_service.workers} search workers)")
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    search_service.shutdown()
+
+
+async def run_search(db: Session, method: str, **kwargs):
+    """Run a fuzzy search on the search service, turning a full queue into a 503."""
+    try:
+        return await search_service.run(db, method, **kwargs)
+    except SearchQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"}) from e
+
 
 # Health check
 @app.get("/", summary="Health Check")
@@ -59,15 +90,34 @@ def get_verse(verse_id: int, db: Session = Depends(get_db)):
     return verse
 
 
-@app.get("/verses/", response_model=list[schemas.Verse], summary="List verses")
-def list_verses(
-    skip: int = Query(0, ge=0, description="Number of verses to skip"),
+@app.get("/verses/", response_model=schemas.VerseListResponse | list[schemas.Verse], summary="List verses")
+async def list_verses(
+    response: Response,
+    paged: bool = Query(False, description="Return a page in reading order with its total and next_cursor"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page; implies paged"),
     limit: int = Query(20, ge=1, le=100, description="Number of verses to return"),
-    db: Session = Depends(get_db),
+    include_total: bool = Query(False, description="Count the verses instead of reading the stored total (paged only)"),
+    skip: int = Query(0, ge=0, description="Number of verses to skip (bare list only)", deprecated=True),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List verses with pagination."""
-    repo = VerseRepository(db)
-    return repo.get_verses(skip=skip, limit=limit)
+    """
+    List verses in reading order, a page at a time.
+
+    Without `paged` or `cursor` this still returns the bare list, paged by
+    `skip`, that clients used before pages had cursors. That form is
+    deprecated: its responses carry a Deprecation header and a Link to the
+    paged form, which will become the default.
+    """
+    repo = AsyncVerseRepository(db)
+    if not paged and cursor is None:
+        response.headers["Deprecation"] = "true"
+        response.headers["Link"] = '</verses/?paged=true>; rel="successor-version"'
+        return await repo.get_verses(skip=skip, limit=limit)
+    try:
+        page = await repo.list_verses(cursor=cursor, limit=limit, include_total=include_total)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return page._asdict()
 
 
 @app.put("/verses/{verse_id}", response_model=schemas.Verse, summary="Update verse")
@@ -91,28 +141,38 @@ def delete_verse(verse_id: int, db: Session = Depends(get_db)):
 
 # Search and navigation endpoints
 @app.post("/search/", response_model=schemas.SearchResponse, summary="Search verses")
-def search_verses(query: schemas.VerseSearchQuery, db: Session = Depends(get_db)):
+async def search_verses(query: schemas.VerseSearchQuery, db: AsyncSession = Depends(get_async_db)):
     """Search verses based on text and filters."""
-    repo = VerseRepository(db)
-    verses, total = repo.search_verses(query)
+    repo = AsyncVerseRepository(db)
+    try:
+        page = await repo.search_verses_page(query)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
     return {
-        "verses": verses,
-        "total": total,
+        "verses": page.verses,
+        "total": page.total,
         "limit": query.limit,
         "offset": query.offset,
+        "snippets": await repo.search_snippets(query.query, page.verses) if query.highlight else None,
+        "total_is_estimate": page.total_is_estimate,
+        "next_cursor": page.next_cursor,
     }
 
 
 @app.get("/search/", response_model=schemas.SearchResponse, summary="Search verses (GET)")
-def search_verses_get(
+async def search_verses_get(
     q: str = Query(..., description="Search query"),
     page_number: int | None = Query(None, description="Filter by page number"),
     raag: str | None = Query(None, description="Filter by raag"),
     author: str | None = Query(None, description="Filter by author"),
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
-    db: Session = Depends(get_db),
+    highlight: bool = Query(False, description="Also return each verse's text with the matches marked"),
+    order: Literal["rank", "reading"] = Query("rank", description="Best match first, or reading order (paged by cursor)"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(False, description="Count the matches exactly instead of reusing a recent count"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Search verses using GET parameters."""
     query = schemas.VerseSearchQuery(
@@ -122,15 +182,19 @@ def search_verses_get(
         author=author,
         limit=limit,
         offset=offset,
+        highlight=highlight,
+        order=order,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return search_verses(query, db)
+    return await search_verses(query, db)
 
 
 @app.get("/pages/{page_number}", response_model=schemas.PageResponse, summary="Get page content")
-def get_page(page_number: int, db: Session = Depends(get_db)):
+async def get_page(page_number: int, db: AsyncSession = Depends(get_async_db)):
     """Get all verses from a specific page."""
-    repo = VerseRepository(db)
-    verses = repo.get_page_content(page_number)
+    repo = AsyncVerseRepository(db)
+    verses = await repo.get_page_content(page_number)
 
     return {"page_number": page_number, "verses": verses, "total_lines": len(verses)}
 
@@ -138,7 +202,7 @@ def get_page(page_number: int, db: Session = Depends(get_db)):
 @app.get("/verses/{verse_id}/context", response_model=list[schemas.Verse], summary="Get verse context")
 def get_verse_context(
     verse_id: int,
-    context: int = Query(3, ge=1, le=10, description="Number of lines before/after"),
+    context: int = Query(3, ge=1, le=10, description="Number of verses before/after, across pages"),
     db: Session = Depends(get_db),
 ):
     """Get verses around a specific verse for context."""
@@ -149,6 +213,26 @@ def get_verse_context(
     return context_verses
 
 
+@app.get("/verses/{verse_id}/next", response_model=schemas.Verse, summary="Get next verse")
+def get_next_verse(verse_id: int, db: Session = Depends(get_db)):
+    """Get the verse after a specific verse in reading order, on the next page if need be."""
+    repo = VerseRepository(db)
+    verse = repo.get_adjacent_verse(verse_id, 1)
+    if verse is None:
+        raise HTTPException(status_code=404, detail="No next verse")
+    return verse
+
+
+@app.get("/verses/{verse_id}/previous", response_model=schemas.Verse, summary="Get previous verse")
+def get_previous_verse(verse_id: int, db: Session = Depends(get_db)):
+    """Get the verse before a specific verse in reading order, on the previous page if need be."""
+    repo = VerseRepository(db)
+    verse = repo.get_adjacent_verse(verse_id, -1)
+    if verse is None:
+        raise HTTPException(status_code=404, detail="No previous verse")
+    return verse
+
+
 @app.get("/verses/page/{page}/line/{line}", response_model=schemas.Verse, summary="Get verse by page and line")
 def get_verse_by_location(page: int, line: int, db: Session = Depends(get_db)):
     """Get verse by page and line number."""
@@ -160,28 +244,49 @@ def get_verse_by_location(page: int, line: int, db: Session = Depends(get_db)):
 
 
 @app.get("/random", response_model=schemas.Verse, summary="Get random verse")
-def get_random_verse(db: Session = Depends(get_db)):
+async def get_random_verse(
+    seed: str | None = Query(None, description="Pick deterministically: the same seed gives the same verse"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """Get a random verse (Hukamnama style)."""
-    repo = VerseRepository(db)
-    verse = repo.get_random_verse()
+    repo = AsyncVerseRepository(db)
+    verse = await repo.get_random_verse(seed=seed)
     if not verse:
         raise HTTPException(status_code=404, detail="No verses found")
     return verse
 
 
+@app.get("/hukamnama", response_model=schemas.HukamnamaResponse, summary="Get the verse of the day")
+def get_hukamnama(
+    day: date | None = Query(None, alias="date", description="Day to pick for (YYYY-MM-DD); today by default"),
+    db: Session = Depends(get_db),
+):
+    """Get the verse picked for a day, together with its whole page."""
+    day = day or date.today()
+    repo = VerseRepository(db)
+    picked = repo.get_hukamnama(day)
+    if not picked:
+        raise HTTPException(status_code=404, detail="No verses found")
+    verse, page_verses = picked
+    return {"date": day, "verse": verse, "page_number": verse.page_number, "page_verses": page_verses}
+
+
 # Fuzzy search endpoints
 @app.post("/fuzzy-search/", response_model=schemas.FuzzySearchResponse, summary="Fuzzy search verses")
-def fuzzy_search_verses(
+async def fuzzy_search_verses(
     search_request: schemas.FuzzySearchRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_only_db)
 ):
     """Find verses using fuzzy string matching."""
-    fuzzy_searcher = SGGSFuzzySearcher(db)
-
-    results = fuzzy_searcher.search_with_preprocessing(
+    results = await run_search(
+        db,
+        "search_with_preprocessing",
         query_text=search_request.query_text,
         limit=search_request.limit,
-        score_cutoff=search_request.score_cutoff
+        score_cutoff=search_request.score_cutoff,
+        clean_text=search_request.clean_text,
+        max_span=search_request.max_span,
+        ratio_type=search_request.ratio_type,
     )
 
     # Convert to response format
@@ -189,7 +294,8 @@ def fuzzy_search_verses(
         schemas.FuzzySearchResult(
             verse=result.verse,
             score=result.score,
-            ratio_type=result.ratio_type
+            ratio_type=result.ratio_type,
+            span=result.span,
         )
         for result in results
     ]
@@ -203,13 +309,14 @@ def fuzzy_search_verses(
 
 
 @app.get("/fuzzy-search/", response_model=schemas.FuzzySearchResponse, summary="Fuzzy search verses (GET)")
-def fuzzy_search_verses_get(
+async def fuzzy_search_verses_get(
     query_text: str = Query(..., description="Text to search for"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
     score_cutoff: float = Query(60.0, ge=0.0, le=100.0, description="Minimum similarity score"),
     ratio_type: str = Query("WRatio", description="Fuzzy matching algorithm"),
     clean_text: bool = Query(True, description="Apply text preprocessing"),
-    db: Session = Depends(get_db)
+    max_span: int = Query(1, ge=1, le=8, description="Match across up to this many consecutive lines"),
+    db: Session = Depends(get_read_only_db)
 ):
     """Find verses using fuzzy string matching (GET endpoint)."""
     search_request = schemas.FuzzySearchRequest(
@@ -217,22 +324,106 @@ def fuzzy_search_verses_get(
         limit=limit,
         score_cutoff=score_cutoff,
         ratio_type=ratio_type,
-        clean_text=clean_text
+        clean_text=clean_text,
+        max_span=max_span,
+    )
+    return await fuzzy_search_verses(search_request, db)
+
+
+@app.post("/fuzzy-search/follow", response_model=schemas.FuzzyFollowResponse, summary="Follow-mode fuzzy search")
+async def fuzzy_search_follow(
+    follow_request: schemas.FuzzyFollowRequest,
+    db: Session = Depends(get_read_only_db)
+):
+    """Search near the last matched verse first, falling back to the whole corpus."""
+    last_verse_id = follow_request.last_verse_id
+    if last_verse_id is None and follow_request.session_id:
+        last_verse_id = follow_sessions.get(follow_request.session_id)
+
+    results, matched_locally = await run_search(
+        db,
+        "follow",
+        query_text=follow_request.query_text,
+        last_verse_id=last_verse_id,
+        limit=follow_request.limit,
+        score_cutoff=follow_request.score_cutoff,
+        ratio_type=follow_request.ratio_type,
+        clean_text=follow_request.clean_text,
+        confidence=follow_request.confidence,
     )
-    return fuzzy_search_verses(search_request, db)
+
+    if results and follow_request.session_id:
+        follow_sessions.set(follow_request.session_id, results[0].verse_id)
+
+    fuzzy_results = [
+        schemas.FuzzySearchResult(
+            verse=result.verse,
+            score=result.score,
+            ratio_type=result.ratio_type
+        )
+        for result in results
+    ]
+
+    return schemas.FuzzyFollowResponse(
+        query_text=follow_request.query_text,
+        results=fuzzy_results,
+        total_found=len(fuzzy_results),
+        search_params=follow_request.model_dump(exclude={"query_text", "session_id"}),
+        matched_locally=matched_locally,
+        session_id=follow_request.session_id,
+    )
+
+
+@app.post("/fuzzy-search/batch", response_model=schemas.FuzzyBatchSearchResponse, summary="Fuzzy search many queries")
+async def fuzzy_search_batch(
+    batch_request: schemas.FuzzyBatchSearchRequest,
+    db: Session = Depends(get_read_only_db)
+):
+    """Score a list of queries against the corpus, sharing one corpus lookup and one verse lookup."""
+    per_query = await run_search(
+        db,
+        "find_closest_matches_many",
+        queries=batch_request.queries,
+        limit=batch_request.limit,
+        score_cutoff=batch_request.score_cutoff,
+        ratio_type=batch_request.ratio_type,
+        clean_text=batch_request.clean_text,
+    )
+
+    search_params = batch_request.model_dump(exclude={"queries"})
+    responses = []
+    for query_text, results in zip(batch_request.queries, per_query, strict=True):
+        fuzzy_results = [
+            schemas.FuzzySearchResult(
+                verse=result.verse,
+                score=result.score,
+                ratio_type=result.ratio_type
+            )
+            for result in results
+        ]
+        responses.append(
+            schemas.FuzzySearchResponse(
+                query_text=query_text,
+                results=fuzzy_results,
+                total_found=len(fuzzy_results),
+                search_params=search_params
+            )
+        )
+
+    return schemas.FuzzyBatchSearchResponse(results=responses, total_queries=len(responses))
 
 
 @app.post("/fuzzy-search/compare", response_model=schemas.FuzzyComparisonResponse, summary="Compare fuzzy search methods")
-def compare_fuzzy_methods(
+async def compare_fuzzy_methods(
     query_text: str = Query(..., description="Text to search for"),
     limit: int = Query(5, ge=1, le=20, description="Results per method"),
     score_cutoff: float = Query(50.0, ge=0.0, le=100.0, description="Minimum similarity score"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_only_db)
 ):
     """Compare the query using multiple fuzzy matching methods."""
-    fuzzy_searcher = SGGSFuzzySearcher(db)
-
-    methods_results = fuzzy_searcher.compare_with_multiple_methods(
+    methods_results = await run_search(
+        db,
+        "compare_with_multiple_methods",
         query_text=query_text,
         limit=limit,
         score_cutoff=score_cutoff
@@ -267,16 +458,16 @@ def compare_fuzzy_methods(
 
 
 @app.get("/fuzzy-search/best-match", response_model=schemas.FuzzySearchResult | None, summary="Find best match")
-def find_best_match(
+async def find_best_match(
     query_text: str = Query(..., description="Text to search for"),
     score_cutoff: float = Query(60.0, ge=0.0, le=100.0, description="Minimum similarity score"),
     ratio_type: str = Query("WRatio", description="Fuzzy matching algorithm"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_only_db)
 ):
     """Find the single best matching verse."""
-    fuzzy_searcher = SGGSFuzzySearcher(db)
-
-    result = fuzzy_searcher.find_best_match(
+    result = await run_search(
+        db,
+        "find_best_match",
         query_text=query_text,
         score_cutoff=score_cutoff,
         ratio_type=ratio_type
@@ -293,13 +484,31 @@ def find_best_match(
 
 # Statistics endpoint
 @app.get("/stats", response_model=schemas.StatsResponse, summary="Get database statistics")
-def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
     """Get database statistics and metrics."""
-    repo = VerseRepository(db)
-    return repo.get_stats()
+    repo = AsyncVerseRepository(db)
+    return await repo.get_stats()
 
 
 # Data management endpoints
+@app.get("/admin/search-cache", summary="Fuzzy search result cache statistics")
+def get_search_cache_stats():
+    """Hit/miss counters and size of the fuzzy search result cache."""
+    return query_result_cache.stats()
+
+
+@app.get("/admin/cleaner-stats", summary="Text cleaning pipeline statistics")
+def get_cleaner_stats():
+    """
+    Per-step time and characters removed, and hit counts for every mapping, over
+    the queries cleaned by this process. Rules that never matched are listed
+    under `unused_mappings`. Collected only when PAATHGUIDE_CLEANER_STATS is set.
+    """
+    if not settings.cleaner_stats:
+        return {"enabled": False}
+    return WhisperTextCleaner(stats=cleaning_stats).get_stage_stats()
+
+
 @app.post("/admin/load-data", summary="Load data from DOCX file")
 def load_data_from_docx(
     file_path: str = Query(..., description="Path to DOCX file"),
@@ -315,6 +524,7 @@ def load_data_from_docx(
             loader.clear_database()
 
         count = loader.load_from_docx_line_by_line(file_path, skip_first)
+        corpus_cache.build(db)
         return {"message": f"Successfully loaded {count} verses", "count": count}
 
     except Exception as e:
@@ -326,6 +536,7 @@ def load_sample_data_endpoint(db: Session = Depends(get_db)):
     """Load sample verses for testing."""
     try:
         load_sample_data(db)
+        corpus_cache.build(db)
         return {"message": "Sample data loaded successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading sample data: {str(e)}") from e
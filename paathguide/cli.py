@@ -1,9 +1,13 @@
 """Command-line interface for managing SGGS data."""
 
+import itertools
+import json
+
 import click
 
 from paathguide.data_loader import SGGSDataLoader, load_sample_data
 from paathguide.db.models import SessionLocal, create_tables
+from paathguide.text_cleaner import WhisperTextCleaner
 
 
 @click.group()
@@ -16,7 +20,15 @@ def cli():
 @click.option("--file-path", "-f", required=True, help="Path to SGGS DOCX file")
 @click.option("--skip-first", "-s", default=2, help="Number of initial lines to skip")
 @click.option("--clear/--no-clear", default=False, help="Clear existing data before loading")
-def load_data(file_path: str, skip_first: int, clear: bool):
+@click.option(
+    "--granularity",
+    "-g",
+    type=click.Choice(["page", "line", "both"]),
+    default="page",
+    show_default=True,
+    help="One row per page, one per line, or both from the same parse",
+)
+def load_data(file_path: str, skip_first: int, clear: bool, granularity: str):
     """Load SGGS data from DOCX file."""
     create_tables()
 
@@ -28,8 +40,10 @@ def load_data(file_path: str, skip_first: int, clear: bool):
             click.echo("Clearing existing data...")
             loader.clear_database()
 
-        # count = loader.load_from_docx_line_by_line(file_path, skip_first)
-        count = loader.load_by_page(file_path, skip_first)
+        if granularity == "line":
+            count = loader.load_from_docx_line_by_line(file_path, skip_first)
+        else:
+            count = loader.load_by_page(file_path, skip_first, include_lines=granularity == "both")
         click.echo(f"✅ Successfully loaded {count} verses")
 
     except Exception as e:
@@ -100,5 +114,76 @@ def stats():
         db.close()
 
 
+@cli.command()
+@click.option("--output", "-o", default="sggs.snapshot", help="Where to write the snapshot")
+def build_snapshot(output: str):
+    """Write the fuzzy search corpus and its indexes to a snapshot file.
+
+    Point PAATHGUIDE_CORPUS_SNAPSHOT at the file and the API and its search
+    workers map it at startup instead of building the corpus from the
+    database. It is ignored once the database changes; rebuild it after loading data.
+    """
+    from .snapshot import build_snapshot as write
+
+    db = SessionLocal()
+    try:
+        size = write(db, output)
+        click.echo(f"✅ Wrote corpus snapshot to {output} ({size / 1e6:.1f} MB)")
+    except Exception as e:
+        click.echo(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+
+@cli.command()
+@click.option("--input-file", "-i", type=click.File("r", encoding="utf-8"), required=True, help="JSONL or TSV file of transcripts ('-' for stdin)")
+@click.option("--output-file", "-o", type=click.File("w", encoding="utf-8"), default="-", help="Where to write the cleaned file ('-' for stdout)")
+@click.option("--format", "file_format", type=click.Choice(["jsonl", "tsv"]), default=None, help="Input format (default: from the file extension)")
+@click.option("--field", default="text", help="JSONL key holding the transcript")
+@click.option("--column", default=0, help="TSV column holding the transcript (0-based)")
+@click.option("--output-field", default="cleaned", help="JSONL key to store the cleaned text under")
+@click.option("--workers", "-w", default=1, help="Worker processes (0 = all cores)")
+@click.option("--chunk-size", default=512, help="Lines sent to a worker at a time")
+def clean_text(input_file, output_file, file_format: str | None, field: str, column: int, output_field: str, workers: int, chunk_size: int):
+    """Clean every transcript in a JSONL or TSV file.
+
+    The file is streamed: each output line is the input record with the cleaned
+    text added (a new JSONL key, or a new last TSV column), in input order.
+    """
+    if file_format is None:
+        file_format = "tsv" if input_file.name.endswith((".tsv", ".tab")) else "jsonl"
+
+    if file_format == "jsonl":
+        records = (json.loads(line) for line in input_file if line.strip())
+
+        def text_of(record: dict) -> str:
+            return str(record.get(field) or "")
+
+        def format_line(record: dict, cleaned: str) -> str:
+            return json.dumps({**record, output_field: cleaned}, ensure_ascii=False) + "\n"
+    else:
+        records = (line.rstrip("\r\n").split("\t") for line in input_file if line.strip())
+
+        def text_of(record: list[str]) -> str:
+            return record[column] if column < len(record) else ""
+
+        def format_line(record: list[str], cleaned: str) -> str:
+            return "\t".join([*record, cleaned]) + "\n"
+
+    try:
+        # tee only buffers the records the cleaner has read ahead, which clean_many bounds
+        records, to_clean = itertools.tee(records)
+        cleaned_texts = WhisperTextCleaner().clean_many(map(text_of, to_clean), workers=workers or None, chunk_size=chunk_size)
+
+        count = 0
+        for record, cleaned in zip(records, cleaned_texts, strict=True):
+            output_file.write(format_line(record, cleaned))
+            count += 1
+        click.echo(f"✅ Cleaned {count} lines", err=True)
+
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,68 @@
+"""Application settings, read from PAATHGUIDE_* environment variables or a .env file."""
+
+import os
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Runtime settings for the API and CLI."""
+
+    model_config = SettingsConfigDict(env_prefix="PAATHGUIDE_", env_file=".env", extra="ignore")
+
+    # Database
+    database_url: str = Field(default="sqlite:///./sggs.db", description="SQLAlchemy database URL")
+    database_journal_mode: Literal["wal", "delete", "truncate", "persist", "memory", "off"] = Field(
+        default="wal",
+        description="SQLite journal mode; WAL lets readers carry on while a load is writing",
+    )
+    database_synchronous: Literal["off", "normal", "full", "extra"] = Field(
+        default="normal",
+        description="SQLite fsync level; NORMAL is durable across crashes of the process in WAL mode",
+    )
+    database_cache_size_kb: int = Field(default=65536, ge=0, description="SQLite page cache per connection, in KiB")
+    database_mmap_size: int = Field(default=268435456, ge=0, description="Bytes of the database file SQLite reads through mmap")
+    database_busy_timeout: float = Field(default=5.0, ge=0, description="Seconds a connection waits for a lock before failing")
+    database_pool_size: int = Field(default=5, ge=1, description="Connections kept open per engine")
+    database_max_overflow: int = Field(default=10, ge=0, description="Extra connections opened under load beyond the pool size")
+    database_async_url: str | None = Field(
+        default=None,
+        description="URL for the async read endpoints; by default database_url through the aiosqlite driver",
+    )
+    database_immutable: bool = Field(
+        default=False,
+        description="Open read-only sessions with immutable=1 (no locking at all); only safe if nothing writes the file",
+    )
+
+    # Fuzzy search corpus
+    corpus_snapshot: str | None = Field(
+        default=None,
+        description="Snapshot written by `build-snapshot`, mapped at startup instead of building the corpus while it matches the database",
+    )
+
+    # Fuzzy search executor
+    search_workers: int = Field(
+        default_factory=lambda: min(4, os.cpu_count() or 1),
+        ge=0,
+        description="Search worker processes, each holding a copy of the corpus; 0 scores in the API process's thread pool instead",
+    )
+    search_queue_depth: int = Field(
+        default=64,
+        ge=0,
+        description="Searches allowed to wait for a free worker before new ones are rejected with 503",
+    )
+
+    # Fuzzy search result cache
+    result_cache_size: int = Field(default=1024, ge=0, description="Cached search results; 0 disables the cache")
+    result_cache_ttl: float = Field(default=300.0, gt=0, description="Seconds a cached search result stays valid")
+
+    # Text cleaner instrumentation
+    cleaner_stats: bool = Field(
+        default=False,
+        description="Record per-step timings and mapping hit counts for cleaned text (see /admin/cleaner-stats)",
+    )
+
+
+settings = Settings()
@@ -0,0 +1,453 @@
+"""Process-wide in-memory verse corpus shared by fuzzy search."""
+
+from array import array
+import bisect
+from collections.abc import Callable, Iterable, Iterator
+import copy
+import logging
+import threading
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from paathguide.config import settings
+from paathguide.db import models
+from paathguide.ngram_index import NGramIndex
+from paathguide.text_cleaner import WhisperTextCleaner
+
+# (id, gurmukhi_text, page_number, line_number)
+VerseRow = tuple[int, str, int | None, int | None]
+
+# Stand-in for NULL page/line numbers inside the integer columns
+MISSING = -1
+
+
+class CorpusPatch(NamedTuple):
+    """
+    One write to the corpus, as replayed onto a `VerseStore`.
+
+    `rows` are added or replaced, carrying their normalized text as a fifth
+    element when the store has a normalized column; `removed` are verse ids to drop.
+    """
+
+    rows: tuple[tuple, ...] = ()
+    removed: tuple[int, ...] = ()
+
+
+logger = logging.getLogger(__name__)
+
+
+class TextColumn:
+    """
+    Many strings stored as one space-joined buffer plus an offsets array.
+
+    Entry ``i`` is ``buffer[offsets[i]:offsets[i + 1] - 1]``; the trailing
+    separator means consecutive entries can also be sliced out as one string.
+    """
+
+    SEPARATOR = " "
+
+    def __init__(self, buffer: str, offsets: array):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, texts: Iterable[str]) -> "TextColumn":
+        offsets = array("I", [0])
+        parts = []
+        position = 0
+        for text in texts:
+            parts.append(text)
+            position += len(text) + 1
+            offsets.append(position)
+        buffer = cls.SEPARATOR.join(parts) + cls.SEPARATOR if parts else ""
+        return cls(buffer, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.buffer[self.offsets[index] : self.offsets[index + 1] - 1]
+
+    def __iter__(self) -> Iterator[str]:
+        buffer, offsets = self.buffer, self.offsets
+        for index in range(len(offsets) - 1):
+            yield buffer[offsets[index] : offsets[index + 1] - 1]
+
+    def span(self, start: int, count: int) -> str:
+        """Entries ``start`` .. ``start + count - 1`` joined by the separator, without copying them one by one."""
+        return self.buffer[self.offsets[start] : self.offsets[start + count] - 1]
+
+    def spliced(self, index: int, removed: int, texts: Iterable[str] = ()) -> "TextColumn":
+        """Copy with `removed` entries from `index` on replaced by `texts`, like ``list[index:index + removed] = texts``."""
+        inserted = TextColumn.from_strings(texts)
+        offsets = self.offsets
+        start, stop = offsets[index], offsets[index + removed]
+        shift = len(inserted.buffer) - (stop - start)
+        spliced = array("I", offsets[: index + 1])
+        spliced.extend(start + offset for offset in inserted.offsets[1:])
+        spliced.extend(offset + shift for offset in offsets[index + removed + 1 :])
+        return TextColumn(self.buffer[:start] + inserted.buffer + self.buffer[stop:], spliced)
+
+    def mean_length(self) -> float:
+        """Average entry length in characters."""
+        return (len(self.buffer) / len(self) - 1) if len(self) else 0.0
+
+
+class VerseStore:
+    """
+    Compact, row-aligned columnar copy of the verse table.
+
+    Rows are kept in reading order (page, line, id). Only the columns fuzzy
+    search needs are held; full `models.Verse` objects are fetched for the
+    handful of rows a search actually returns.
+
+    `normalized` optionally holds every line passed through a
+    `WhisperTextCleaner`, so cleaned queries can be scored against a cleaned
+    corpus; `normalizer` is the fingerprint of the cleaner that produced it.
+
+    A store loaded by `paathguide.snapshot.load_snapshot` reads its columns
+    straight from the mapped file, and `snapshot_path` names that file.
+    """
+
+    # Rows one `patched` call edits in place before rebuilding the columns is cheaper
+    PATCH_LIMIT = 64
+
+    def __init__(self, ids: array, page_numbers: array, line_numbers: array, text: TextColumn, version: int):
+        self.ids = ids
+        self.page_numbers = page_numbers
+        self.line_numbers = line_numbers
+        self.text = text
+        self.version = version
+        self.normalized: TextColumn | None = None
+        self.normalizer: str | None = None
+        self._ngram_indexes: dict[bool, NGramIndex] = {}
+        self._row_by_id: dict[int, int] | None = None
+        self.snapshot_path: str | None = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[VerseRow | tuple], version: int = 0, normalizer: str | None = None) -> "VerseStore":
+        """
+        Build a store from (id, text, page, line) rows, sorting them into reading order.
+
+        When `normalizer` is given, every row carries its normalized text as a fifth element.
+        """
+        ordered = sorted(rows, key=_reading_order)
+        store = cls(
+            ids=array("q", (row[0] for row in ordered)),
+            page_numbers=array("i", (MISSING if row[2] is None else row[2] for row in ordered)),
+            line_numbers=array("i", (MISSING if row[3] is None else row[3] for row in ordered)),
+            text=TextColumn.from_strings(row[1] for row in ordered),
+            version=version,
+        )
+        if normalizer is not None:
+            store.normalized = TextColumn.from_strings(row[4] for row in ordered)
+            store.normalizer = normalizer
+        return store
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def rows(self) -> Iterator[VerseRow]:
+        """Iterate the store back out as (id, text, page, line) rows."""
+        for index, text in enumerate(self.text):
+            page = self.page_numbers[index]
+            line = self.line_numbers[index]
+            yield self.ids[index], text, None if page == MISSING else page, None if line == MISSING else line
+
+    def row_of(self, verse_id: int) -> int | None:
+        """Row position of a verse id, or None if it is not in the store."""
+        if self._row_by_id is None:
+            self._row_by_id = {row_id: row for row, row_id in enumerate(self.ids)}
+        return self._row_by_id.get(verse_id)
+
+    def texts(self, normalized: bool = False) -> TextColumn:
+        """The column to score against: raw Gurmukhi, or the cleaned copy if built."""
+        if normalized and self.normalized is not None:
+            return self.normalized
+        return self.text
+
+    def normalized_by(self, clean: Callable[[str], str], normalizer: str) -> "VerseStore":
+        """Return a copy sharing this store's columns with a freshly normalized text column."""
+        if self.snapshot_path is not None:
+            # The copy no longer matches the file, so it gets columns of its own rather than the mapped ones
+            return VerseStore.from_rows(((*row, clean(row[1])) for row in self.rows()), self.version, normalizer)
+        store = copy.copy(self)
+        store.normalized = TextColumn.from_strings(map(clean, self.text))
+        store.normalizer = normalizer
+        # Only the raw-text index still describes the copy
+        raw_index = self._ngram_indexes.get(False)
+        store._ngram_indexes = {False: raw_index} if raw_index is not None else {}
+        return store
+
+    def ngram_index(self, normalized: bool = False) -> NGramIndex:
+        """Character trigram index over the chosen text column, built on first use."""
+        key = normalized and self.normalized is not None
+        index = self._ngram_indexes.get(key)
+        if index is None:
+            index = self._ngram_indexes[key] = NGramIndex.build(self.texts(key))
+        return index
+
+    def patched(self, patch: "CorpusPatch", version: int) -> "VerseStore":
+        """
+        Return a copy with `patch` applied, patching the columns and n-gram indexes in place of a rebuild.
+
+        Rows whose text and position are unchanged (e.g. after a translation-only
+        edit) are left alone, and changed rows are moved to their bisected place
+        in reading order. A patch touching more than `PATCH_LIMIT` rows rebuilds
+        the columns instead and leaves the indexes to be built again.
+        """
+        normalized = self.normalized is not None
+        changed = {}
+        for row in patch.rows:
+            position = self.row_of(row[0])
+            if position is None or self._row(position) != tuple(row[:4]) or (normalized and self.normalized[position] != row[4]):
+                changed[row[0]] = row
+        removed = {verse_id for verse_id in patch.removed if self.row_of(verse_id) is not None and verse_id not in changed}
+
+        if not changed and not removed:
+            store = copy.copy(self)
+            store.version = version
+            store._ngram_indexes = dict(self._ngram_indexes)
+            return store
+        if len(changed) + len(removed) > self.PATCH_LIMIT:
+            rows = self.rows() if not normalized else ((*row, text) for row, text in zip(self.rows(), self.normalized, strict=True))
+            kept = (row for row in rows if row[0] not in changed and row[0] not in removed)
+            return VerseStore.from_rows([*kept, *changed.values()], version, self.normalizer)
+
+        ids, page_numbers, line_numbers = array("q", self.ids), array("i", self.page_numbers), array("i", self.line_numbers)
+        text, normalized_text = self.text, self.normalized
+        edits: list[tuple[int, tuple | None]] = []
+
+        # Drop from the end first, so the positions still to drop stay put
+        dropped = (self.row_of(verse_id) for verse_id in (*changed, *removed))
+        for position in sorted((position for position in dropped if position is not None), reverse=True):
+            for column in (ids, page_numbers, line_numbers):
+                del column[position]
+            text = text.spliced(position, 1)
+            if normalized_text is not None:
+                normalized_text = normalized_text.spliced(position, 1)
+            edits.append((position, None))
+        for row in changed.values():
+            position = bisect.bisect_left(range(len(ids)), _reading_order(row), key=lambda i: _reading_order((ids[i], None, _number(page_numbers[i]), _number(line_numbers[i]))))
+            ids.insert(position, row[0])
+            page_numbers.insert(position, MISSING if row[2] is None else row[2])
+            line_numbers.insert(position, MISSING if row[3] is None else row[3])
+            text = text.spliced(position, 0, [row[1]])
+            if normalized_text is not None:
+                normalized_text = normalized_text.spliced(position, 0, [row[4]])
+            edits.append((position, row))
+
+        store = VerseStore(ids, page_numbers, line_numbers, text, version)
+        store.normalized, store.normalizer = normalized_text, self.normalizer
+        for key, index in self._ngram_indexes.items():
+            text_at = 4 if key else 1
+            store._ngram_indexes[key] = index.patched(((position, row and row[text_at]) for position, row in edits), len(self))
+        return store
+
+    def _row(self, position: int) -> VerseRow:
+        return self.ids[position], self.text[position], _number(self.page_numbers[position]), _number(self.line_numbers[position])
+
+    def ngram_edits(self) -> int:
+        """Most rows patched into any of the store's n-gram indexes since it was built."""
+        return max((index.edits for index in self._ngram_indexes.values()), default=0)
+
+
+def _reading_order(row: tuple) -> tuple:
+    verse_id, _, page, line = row[:4]
+    return (page is None, page or 0, line is None, line or 0, verse_id)
+
+
+def _number(value: int) -> int | None:
+    return None if value == MISSING else value
+
+
+def _as_row(verse: models.Verse) -> VerseRow:
+    return verse.id, str(verse.gurmukhi_text), verse.page_number, verse.line_number  # type: ignore
+
+
+class CorpusCache:
+    """
+    Shared, versioned cache of every verse, built once and patched on write.
+
+    Readers always get a complete `VerseStore`; writers replace the store
+    (copy-on-write) instead of mutating it, so a search that is already running
+    keeps scoring against a consistent corpus.
+
+    The last `PATCH_LOG_SIZE` patches are kept with the version each produced,
+    so holders of an older copy of the store (the search workers) can replay
+    them rather than reload the corpus. Once a store's n-gram indexes carry
+    `COMPACT_AFTER` patched rows, they are rebuilt on a background thread.
+    """
+
+    PATCH_LOG_SIZE = 256
+    COMPACT_AFTER = 256
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._store: VerseStore | None = None
+        self._cleaner: WhisperTextCleaner | None = None
+        self._version = 0
+        # (version, patch) for every patch since the store at `_log_start` was installed
+        self._log: list[tuple[int, CorpusPatch]] = []
+        self._log_start = 0
+        self._compacting = False
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every build, patch or invalidation."""
+        return self._version
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._store is not None
+
+    @property
+    def current(self) -> VerseStore | None:
+        """The cached store if one is loaded; never builds it."""
+        return self._store
+
+    def get(self, db: Session, cleaner: WhisperTextCleaner | None = None) -> VerseStore:
+        """
+        Return the current store, building it from the database on first use.
+
+        If `cleaner` is given, the store's normalized column is (re)built whenever
+        it was produced by a cleaner with a different configuration.
+        """
+        store = self._store
+        if store is None:
+            store = self.build(db)
+        if cleaner is not None:
+            if store.normalizer != cleaner.fingerprint():
+                store = self._normalize(store, cleaner)
+            elif self._cleaner is None:
+                # e.g. a snapshot normalized by this configuration; later patches are cleaned with it
+                self._cleaner = _quiet(cleaner)
+        return store
+
+    def build(self, db: Session, cleaner: WhisperTextCleaner | None = None) -> VerseStore:
+        """Load every verse from the database and install it as the current store."""
+        started_at = self._version
+        store = self._from_snapshot(db)
+        if store is None:
+            verse = models.Verse
+            rows = db.execute(select(verse.id, verse.gurmukhi_text, verse.page_number, verse.line_number)).all()
+            store = VerseStore.from_rows(rows)
+
+        with self._lock:
+            if self._version != started_at:
+                # A write landed while we were reading; serve this build but don't cache it
+                store.version = self._version
+                return store
+            self._install(store)
+
+        if cleaner is not None:
+            store = self._normalize(store, cleaner)
+        return store
+
+    def _from_snapshot(self, db: Session) -> VerseStore | None:
+        """The configured corpus snapshot, if it was built from the database's current corpus."""
+        if not settings.corpus_snapshot:
+            return None
+        from paathguide.snapshot import SnapshotError, corpus_stamp, load_snapshot
+
+        stamp = corpus_stamp(db)
+        if stamp is None:
+            return None
+        try:
+            return load_snapshot(settings.corpus_snapshot, stamp)
+        except (OSError, SnapshotError) as e:
+            logger.warning(f"Not using corpus snapshot, building the corpus from the database: {e}")
+            return None
+
+    def _normalize(self, store: VerseStore, cleaner: WhisperTextCleaner) -> VerseStore:
+        """Clean every line once and install the result if the store is still current."""
+        quiet = _quiet(cleaner)
+        normalized = store.normalized_by(quiet.clean_stt_output, cleaner.fingerprint())
+
+        with self._lock:
+            if self._store is store:
+                self._install(normalized)
+                self._cleaner = quiet
+        return normalized
+
+    def _install(self, store: VerseStore | None) -> None:
+        """Replace the store other than by a patch: under a new version, with an empty patch log."""
+        self._version += 1
+        if store is not None:
+            store.version = self._version
+        self._store = store
+        self._log = []
+        self._log_start = self._version
+
+    def upsert(self, verses: Iterable[models.Verse]) -> None:
+        """Add or replace verses in the cached corpus."""
+        rows = tuple(map(_as_row, verses))
+        with self._lock:
+            store = self._store
+            if store is not None and store.normalized is not None:
+                if self._cleaner is None:
+                    # No way to clean the new rows like the rest; rebuild on next use
+                    self._install(None)
+                    return
+                rows = tuple((*row, self._cleaner.clean_stt_output(row[1])) for row in rows)
+            self._patch(CorpusPatch(rows=rows))
+
+    def remove(self, verse_ids: Iterable[int]) -> None:
+        """Drop verses from the cached corpus."""
+        with self._lock:
+            self._patch(CorpusPatch(removed=tuple(verse_ids)))
+
+    def _patch(self, patch: CorpusPatch) -> None:
+        if self._store is None:
+            self._install(None)
+            return
+        self._version += 1
+        self._store = self._store.patched(patch, self._version)
+        self._log.append((self._version, patch))
+        if len(self._log) > self.PATCH_LOG_SIZE:
+            self._log_start = self._log.pop(0)[0]
+        if self._store.ngram_edits() >= self.COMPACT_AFTER and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self._compact, name="corpus-compact", daemon=True).start()
+
+    def _compact(self) -> None:
+        """Rebuild the current store's patched n-gram indexes, off the write path."""
+        try:
+            while (store := self._store) is not None and store.ngram_edits() >= self.COMPACT_AFTER:
+                for normalized in [key for key, index in store._ngram_indexes.items() if index.edits]:
+                    # Describes the same rows as the patched index it replaces, so readers may see either
+                    store._ngram_indexes[normalized] = NGramIndex.build(store.texts(normalized))
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def patches_since(self, version: int) -> list[tuple[int, CorpusPatch]] | None:
+        """
+        The (version, patch) pairs that turn the store installed at `version` into the current one.
+
+        None if the store has since been replaced other than by patching, or
+        the patches have dropped out of the log.
+        """
+        with self._lock:
+            if version < self._log_start or version > self._version:
+                return None
+            return [entry for entry in self._log if entry[0] > version]
+
+    def invalidate(self) -> None:
+        """Forget the cached corpus; the next reader rebuilds it from the database."""
+        with self._lock:
+            self._install(None)
+
+
+def _quiet(cleaner: WhisperTextCleaner) -> WhisperTextCleaner:
+    """A copy of `cleaner` for corpus lines: step logging for 60k lines would drown the log."""
+    quiet = copy.copy(cleaner)
+    quiet.enable_logging = False
+    quiet.stats = None  # corpus lines aren't query traffic
+    return quiet
+
+
+# Shared by every SGGSFuzzySearcher in this process
+corpus_cache = CorpusCache()
@@ -1,11 +1,62 @@
 """Data loader to populate the database from DOCX file."""
 
-from docx import Document
+from collections.abc import Callable, Iterable, Iterator
+import itertools
+import zipfile
+
+from lxml import etree
 from sqlalchemy.orm import Session
 
+from paathguide.corpus import corpus_cache
 from paathguide.db import models, schemas
 from paathguide.db.repository import VerseRepository
 
+# Main document part of a .docx, and the WordprocessingML elements read from it
+DOCUMENT_PART = "word/document.xml"
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY, _PARAGRAPH, _RUN, _HYPERLINK, _TEXT, _BREAK = (f"{_W}{tag}" for tag in ("body", "p", "r", "hyperlink", "t", "br"))
+# Run content with a fixed text equivalent, as python-docx renders it
+_RUN_SYMBOLS = {f"{_W}tab": "\t", f"{_W}ptab": "\t", f"{_W}cr": "\n", f"{_W}noBreakHyphen": "-"}
+
+
+def iter_paragraphs(file_path: str) -> Iterator[str]:
+    """
+    Yield the text of each top-level paragraph of a DOCX file, in document order.
+
+    The text matches python-docx's `Paragraph.text`, but `word/document.xml`
+    is parsed incrementally and each paragraph is dropped once it has been
+    read, so memory stays flat however long the document is.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open(DOCUMENT_PART) as document:
+        for _, paragraph in etree.iterparse(document, events=("end",), tag=_PARAGRAPH):
+            body = paragraph.getparent()
+            # Paragraphs inside tables are skipped, as in python-docx; they go with their table below
+            if body.tag != _BODY:
+                continue
+            yield _paragraph_text(paragraph)
+            paragraph.clear(keep_tail=True)
+            while paragraph.getprevious() is not None:
+                del body[0]
+
+
+def _paragraph_text(paragraph: etree._Element) -> str:
+    runs = itertools.chain.from_iterable(
+        [child] if child.tag == _RUN else child.iterfind(_RUN)
+        for child in paragraph
+        if child.tag in (_RUN, _HYPERLINK)
+    )
+    parts = []
+    for run in runs:
+        for child in run:
+            if child.tag == _TEXT:
+                parts.append(child.text or "")
+            elif child.tag == _BREAK:
+                # Page and column breaks have no text equivalent
+                parts.append("\n" if child.get(f"{_W}type", "textWrapping") == "textWrapping" else "")
+            else:
+                parts.append(_RUN_SYMBOLS.get(child.tag, ""))
+    return "".join(parts)
+
 
 class SGGSDataLoader:
     """Loader for SGGS data from DOCX file."""
@@ -14,137 +65,95 @@ class SGGSDataLoader:
         self.db = db
         self.repo = VerseRepository(db)
 
-    def load_from_docx_line_by_line(self, file_path: str, skip_first: int = 2) -> int:
+    def _read_verses(self, file_path: str, skip_first: int) -> Iterator[models.VerseLine]:
+        """Parsed (text, page, line) rows of the document, after the header lines, streamed as it is read."""
+        lines = (text for text in map(str.strip, iter_paragraphs(file_path)) if text)
+        verses = map(models.split_verse_line, itertools.islice(lines, skip_first, None))
+        return (verse for verse in verses if verse[0])
+
+    def _insert(self, verses: Iterable[models.VerseLine], progress: Callable[[int], None] | None) -> int:
+        """Insert parsed rows in one transaction, rolling back if anything fails."""
+        try:
+            return self.repo.bulk_insert_lines(verses, progress=progress)
+        except Exception as e:
+            print(f"Error inserting verses: {e}")
+            self.db.rollback()
+            raise
+
+    def load_from_docx_line_by_line(
+        self, file_path: str, skip_first: int = 2, progress: Callable[[int], None] | None = None
+    ) -> int:
         """
         Load SGGS data from DOCX file.
 
+        Lines go from the document to the database as they are read, without
+        holding the document or its lines in memory.
+
         Args:
             file_path: Path to the DOCX file
             skip_first: Number of initial lines to skip (default 2 for headers)
+            progress: Called with the number of verses inserted so far as the insert proceeds
 
         Returns:
             Number of verses loaded
         """
         print(f"Loading SGGS data from {file_path}...")
 
-        # Read document
-        doc = Document(file_path)
-        lines = []
-
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            if text:
-                lines.append(text)
-
-        # Skip header lines
-        lines = lines[skip_first:]
-        print(f"Found {len(lines)} lines to process")
-
-        # Parse and create verses
-        verses_data = []
-        skipped_count = 0
-
-        for i, line in enumerate(lines):
-            try:
-                parsed = models.parse_verse_line(line)
-                # Only add if we have valid data
-                if parsed["gurmukhi_text"]:
-                    verse_data = schemas.VerseCreate(**parsed)
-                    verses_data.append(verse_data)
-                else:
-                    skipped_count += 1
-
-            except Exception as e:
-                print(f"Error parsing line {i}: {line[:50]}... - {e}")
-                skipped_count += 1
-                continue
-
-        print(f"Parsed {len(verses_data)} verses, skipped {skipped_count} lines")
-
-        # Bulk insert verses
-        if verses_data:
-            try:
-                # Insert in batches to avoid memory issues
-                batch_size = 1000
-                total_inserted = 0
-
-                for i in range(0, len(verses_data), batch_size):
-                    batch = verses_data[i : i + batch_size]
-                    self.repo.bulk_create_verses(batch)
-                    total_inserted += len(batch)
-                    print(
-                        f"Inserted batch {i // batch_size + 1}: {total_inserted}/{len(verses_data)} verses"
-                    )
+        total_inserted = self._insert(self._read_verses(file_path, skip_first), progress)
 
-                print(f"Successfully loaded {total_inserted} verses into database")
-                return total_inserted
+        print(f"Successfully loaded {total_inserted} verses into database")
+        return total_inserted
 
-            except Exception as e:
-                print(f"Error inserting verses: {e}")
-                self.db.rollback()
-                raise
-
-        return 0
-
-    def load_by_page(self, file_path: str, skip_first: int = 2) -> int:
+    def load_by_page(
+        self,
+        file_path: str,
+        skip_first: int = 2,
+        include_lines: bool = False,
+        progress: Callable[[int], None] | None = None,
+    ) -> int:
         """
         Load SGGS data from DOCX file, grouping all gurmukhi_text by page_number.
-        Each row in the Verse table will represent one page, with all lines for that page concatenated.
+        Each page becomes one Verse row (line_number 0) holding its lines in line order.
+
+        The document is parsed once and every row is inserted in a single transaction.
 
         Args:
             file_path: Path to the DOCX file
             skip_first: Number of initial lines to skip (default 2 for headers)
+            include_lines: Also insert every line as its own row, from the same parse
+            progress: Called with the number of rows inserted so far as the insert proceeds
 
         Returns:
-            Number of pages loaded
+            Number of rows loaded (pages, plus lines with include_lines)
         """
         print(f"Loading SGGS data by page from {file_path}...")
 
-        doc = Document(file_path)
-        lines = [para.text.strip() for para in doc.paragraphs if para.text.strip()]
-        lines = lines[skip_first:]
-
-        # Group lines by page_number
-        pages = {}
-        for i, line in enumerate(lines):
-            try:
-                parsed = models.parse_verse_line(line)
-                page = parsed.get("page_number")
-                text = parsed.get("gurmukhi_text", "")
-                if page and text:
-                    if page not in pages:
-                        pages[page] = []
-                    pages[page].append(text)
-            except Exception as e:
-                print(f"Error parsing line {i}: {line[:50]}... - {e}")
-                continue
-
-        print(f"Found {len(pages)} pages to insert")
-
-        # Insert each page as a single Verse row with concatenated text and line_number=0
-        inserted = 0
-        for page, texts in pages.items():
-            full_text = " ".join(texts)  # space-separated
-            verse_data = schemas.VerseCreate(
-                gurmukhi_text=full_text,
-                page_number=page,
-                line_number=0,
-                translation=None,
-                transliteration=None,
-                raag=None,
-                author=None
-            )
-            self.repo.create_verse(verse_data)
-            inserted += 1
-
-        self.db.commit()
-        print(f"Inserted {inserted} pages into database (one row per page)")
+        # Only the page texts are kept; line rows stream straight through to the insert
+        pages: dict[int, list[tuple[int, str]]] = {}
+        counts = {"pages": 0, "lines": 0}
+
+        def rows() -> Iterator[models.VerseLine]:
+            for text, page, line in self._read_verses(file_path, skip_first):
+                if page:
+                    pages.setdefault(page, []).append((line, text))
+                if include_lines:
+                    counts["lines"] += 1
+                    yield text, page, line
+            # The document isn't in page order, so lines are put back in order before joining
+            for page, texts in sorted(pages.items()):
+                counts["pages"] += 1
+                yield " ".join(text for _, text in sorted(texts, key=lambda entry: entry[0])), page, 0
+
+        inserted = self._insert(rows(), progress)
+        print(f"Inserted {inserted} rows into database ({counts['pages']} pages, {counts['lines']} lines)")
         return inserted
 
     def clear_database(self):
         """Clear all verses from the database."""
         self.db.query(models.Verse).delete()
+        self.repo.refresh_stats()
         self.db.commit()
+        corpus_cache.invalidate()
         print("Database cleared")
 
     def reload_data(self, file_path: str, skip_first: int = 2) -> int:
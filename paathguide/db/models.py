@@ -1,19 +1,40 @@
 """Database models for SGGS verses."""
 
-from datetime import datetime
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
 import re
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, create_engine
+from sqlalchemy import Column, DateTime, Float, Index, Integer, MetaData, String, Table, Text, create_engine, event, inspect
+from sqlalchemy.engine import URL, Connection, Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from paathguide.config import settings
+
 Base = declarative_base()
 
+# Spacing between consecutive `seq` values after a renumbering: about ten inserts at the same spot fit before the next one
+SEQ_GAP = 1024
+
+
+def utc_now() -> datetime:
+    """The current UTC time, naive like the DateTime columns it is stored in."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
 
 class Verse(Base):
     """Model for storing SGGS verses."""
 
     __tablename__ = "verses"
+    __table_args__ = (
+        # Reading order; with the implicit rowid it serves ORDER BY page_number, line_number, id.
+        # Not unique: a printed line often holds more than one verse
+        Index("ix_verses_page_line", "page_number", "line_number"),
+        Index("uq_verses_seq", "seq", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     gurmukhi_text = Column(Text, nullable=False, index=True)
@@ -23,12 +44,148 @@ class Verse(Base):
     translation = Column(Text, nullable=True)
     raag = Column(String(100), nullable=True, index=True)
     author = Column(String(100), nullable=True, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utc_now)
+    # Sort key for reading order (page, line, id) across the whole text: SEQ_GAP apart when
+    # numbered, so single inserts fit in between; NULL for lines without a page and line
+    # number. Maintained by VerseRepository
+    seq = Column(Integer, nullable=True)
 
     def __repr__(self):
         return f"<Verse(page={self.page_number}, line={self.line_number}, text='{self.gurmukhi_text[:30]}...')>"
 
 
+class CorpusStats(Base):
+    """Materialized /stats numbers (a single row), kept current by every write through VerseRepository."""
+
+    __tablename__ = "corpus_stats"
+
+    id = Column(Integer, primary_key=True)
+    total_verses = Column(Integer, nullable=False, default=0)
+    total_pages = Column(Integer, nullable=False, default=0)
+    verses_with_translations = Column(Integer, nullable=False, default=0)
+    verses_with_transliterations = Column(Integer, nullable=False, default=0)
+    unique_raags = Column(Integer, nullable=False, default=0)
+    unique_authors = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+
+
+# Full-text index over the verse text, for substring search. The trigram
+# tokenizer indexes every 3-character sequence, so a quoted query matches
+# exactly the rows LIKE '%query%' would, without scanning the table. It is an
+# external-content table: the text lives only in `verses`, and the triggers
+# keep the index in step with every insert, update and delete.
+SEARCH_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS verses_fts USING fts5(gurmukhi_text, content='verses', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS verses_fts_insert AFTER INSERT ON verses BEGIN INSERT INTO verses_fts(rowid, gurmukhi_text) VALUES (new.id, new.gurmukhi_text); END",
+    "CREATE TRIGGER IF NOT EXISTS verses_fts_delete AFTER DELETE ON verses BEGIN INSERT INTO verses_fts(verses_fts, rowid, gurmukhi_text) VALUES ('delete', old.id, old.gurmukhi_text); END",
+    "CREATE TRIGGER IF NOT EXISTS verses_fts_update AFTER UPDATE OF id, gurmukhi_text ON verses BEGIN "
+    "INSERT INTO verses_fts(verses_fts, rowid, gurmukhi_text) VALUES ('delete', old.id, old.gurmukhi_text); "
+    "INSERT INTO verses_fts(rowid, gurmukhi_text) VALUES (new.id, new.gurmukhi_text); END",
+)
+# Shortest query the trigram index can answer; shorter ones fall back to LIKE
+SEARCH_INDEX_MIN_QUERY = 3
+
+# For building queries against the index; kept out of Base.metadata so create_all never touches it
+verses_fts = Table(
+    "verses_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("gurmukhi_text", Text),
+    Column("rank", Float),
+)
+
+
+def search_index_exists(connection: Connection) -> bool:
+    """Whether the verse full-text index has been created in this database."""
+    if connection.dialect.name != "sqlite":
+        return False
+    return connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'verses_fts'").first() is not None
+
+
+def create_search_index(connection: Connection) -> bool:
+    """
+    Create the verse full-text index and its triggers if they don't exist yet.
+
+    A newly created index is filled from the rows already in `verses`.
+
+    Returns:
+        Whether the index is available. False on databases other than SQLite, or
+        SQLite builds without FTS5 or its trigram tokenizer (3.34+); text search
+        then falls back to LIKE.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    existed = search_index_exists(connection)
+    try:
+        for statement in SEARCH_INDEX_DDL:
+            connection.exec_driver_sql(statement)
+    except OperationalError:
+        return False
+    if not existed:
+        connection.exec_driver_sql("INSERT INTO verses_fts(verses_fts) VALUES ('rebuild')")
+    return True
+
+
+@contextmanager
+def search_index_deferred(connection: Connection) -> Iterator[None]:
+    """
+    Hold off the full-text index's insert trigger during a bulk insert.
+
+    The rows inserted meanwhile are indexed with one statement at the end,
+    several times faster than firing the trigger row by row. Run it inside the
+    load's transaction, so a failed load also restores the trigger on rollback.
+    """
+    if not search_index_exists(connection):
+        yield
+        return
+    last_id = connection.exec_driver_sql("SELECT coalesce(max(id), 0) FROM verses").scalar()
+    connection.exec_driver_sql("DROP TRIGGER IF EXISTS verses_fts_insert")
+    yield
+    connection.exec_driver_sql("INSERT INTO verses_fts(rowid, gurmukhi_text) SELECT id, gurmukhi_text FROM verses WHERE id > ?", (last_id,))
+    connection.exec_driver_sql(SEARCH_INDEX_DDL[1])
+
+
+def renumber_reading_order(connection: Connection) -> None:
+    """Number every verse that has a page and line number by its place in reading order, `SEQ_GAP` apart."""
+    connection.exec_driver_sql("UPDATE verses SET seq = NULL WHERE seq IS NOT NULL")
+    connection.exec_driver_sql(
+        f"UPDATE verses SET seq = ordered.n * {SEQ_GAP} FROM ("
+        "SELECT id, row_number() OVER (ORDER BY page_number, line_number, id) AS n FROM verses "
+        "WHERE page_number IS NOT NULL AND line_number IS NOT NULL"
+        ") AS ordered WHERE verses.id = ordered.id"
+    )
+
+
+def migrate_reading_order(connection: Connection) -> None:
+    """Add the `seq` column to databases created before it existed, and number any verses missing from it."""
+    if "seq" not in {column["name"] for column in inspect(connection).get_columns("verses")}:
+        connection.exec_driver_sql("ALTER TABLE verses ADD COLUMN seq INTEGER")
+    unnumbered = connection.exec_driver_sql("SELECT 1 FROM verses WHERE seq IS NULL AND page_number IS NOT NULL AND line_number IS NOT NULL LIMIT 1").first()
+    if unnumbered:
+        renumber_reading_order(connection)
+
+
+@event.listens_for(Verse.__table__, "after_create")
+def _create_search_index(target, connection: Connection, **kwargs) -> None:
+    create_search_index(connection)
+
+
+# Text followed by (page-line). The source document mostly separates the two with a soft hyphen
+VERSE_LINE_RE = re.compile(r"^(.+?)\s*\((\d+)[-\u00ad](\d+)\)\s*$")
+
+# (gurmukhi_text, page_number, line_number), as inserted by the bulk loader
+VerseLine = tuple[str, int | None, int | None]
+
+
+def split_verse_line(line: str) -> VerseLine:
+    """Parse a line like 'ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ ॥ (1-4)' into (text, page, line); the numbers are None if it has none."""
+    line = line.strip()
+    match = VERSE_LINE_RE.match(line)
+    if match is None:
+        return line, None, None
+    return match.group(1).strip(), int(match.group(2)), int(match.group(3))
+
+
 def parse_verse_line(line: str) -> dict:
     """
     Parse a line like 'ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ ॥ (1-4)' into components.
@@ -45,30 +202,121 @@ def parse_verse_line(line: str) -> dict:
         }
         ```
     """
-    # Pattern to match text followed by (page-line)
-    pattern = r"^(.+?)\s*\((\d+)-(\d+)\)\s*$"
-    match = re.match(pattern, line.strip())
+    text, page, line_num = split_verse_line(line)
+    return {"gurmukhi_text": text, "page_number": page, "line_number": line_num}
 
-    if match:
-        text = match.group(1).strip()
-        page = int(match.group(2))
-        line_num = int(match.group(3))
 
-        return {"gurmukhi_text": text, "page_number": page, "line_number": line_num}
-    else:
-        # If pattern doesn't match, treat as plain text
-        return {"gurmukhi_text": line.strip(), "page_number": None, "line_number": None}
+# Database setup
+SQLALCHEMY_DATABASE_URL = settings.database_url
 
 
-# Database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sggs.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+def _is_sqlite_file(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def read_only_url(url: str | URL) -> URL:
+    """
+    The URL of a read-only connection to the same SQLite file.
+
+    With `database_immutable` SQLite also skips locking and change detection,
+    which is only safe for a file nothing writes to while it is open.
+    """
+    url = make_url(url)
+    query = {"mode": "ro", "uri": "true"}
+    if settings.database_immutable:
+        query["immutable"] = "1"
+    return url.set(database=f"file:{url.database}").update_query_dict(query)
+
+
+def make_engine(url: str | URL, read_only: bool = False) -> Engine:
+    """
+    Create an engine with the pool and (for SQLite files) pragmas from settings.
+
+    Args:
+        url: Database URL
+        read_only: Open the SQLite file read-only, for sessions that never write
+    """
+    url = make_url(url)
+    if not _is_sqlite_file(url):
+        connect_args = {"check_same_thread": False} if url.get_backend_name() == "sqlite" else {}
+        return create_engine(url, connect_args=connect_args)
+
+    engine = create_engine(
+        read_only_url(url) if read_only else url,
+        connect_args={"check_same_thread": False, "timeout": settings.database_busy_timeout},
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+    )
+    _configure_sqlite(engine, read_only)
+    return engine
+
+
+def make_async_engine(url: str | URL) -> AsyncEngine:
+    """
+    Create an async engine, with the same pool and pragmas as `make_engine` for SQLite files.
+
+    SQLite URLs are switched to the aiosqlite driver; any other URL must already name an async driver.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(url)
+    url = url.set(drivername="sqlite+aiosqlite")
+    if not _is_sqlite_file(url):
+        return create_async_engine(url)
+
+    engine = create_async_engine(
+        url,
+        connect_args={"timeout": settings.database_busy_timeout},
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+    )
+    _configure_sqlite(engine.sync_engine, read_only=False)
+    return engine
+
+
+def _configure_sqlite(engine: Engine, read_only: bool) -> None:
+    """Apply the SQLite settings to every connection `engine` opens, and make its transactions cover DDL."""
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, _):
+        # The driver would only open a transaction at the first INSERT/UPDATE/DELETE, leaving
+        # earlier DDL (such as a bulk load dropping a trigger) autocommitted; BEGIN is emitted below instead
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # Persistent in the file; a read-only connection can't change it and doesn't need to
+            cursor.execute(f"PRAGMA journal_mode={settings.database_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.database_synchronous}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.database_cache_size_kb}")
+        cursor.execute(f"PRAGMA mmap_size={settings.database_mmap_size}")
+        cursor.execute("PRAGMA temp_store=memory")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+engine = make_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Searches and other pure reads; shares the main engine where a read-only one isn't possible
+read_only_engine = make_engine(SQLALCHEMY_DATABASE_URL, read_only=True) if _is_sqlite_file(make_url(SQLALCHEMY_DATABASE_URL)) else engine
+ReadOnlySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_only_engine)
+# The async read endpoints; objects stay usable after commit, as the response is built from them
+async_engine = make_async_engine(settings.database_async_url or SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
+    # Databases created before a column or index existed get it (and are indexed) here
+    with engine.begin() as connection:
+        migrate_reading_order(connection)
+    for index in Verse.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    with engine.begin() as connection:
+        create_search_index(connection)
 
 
 def get_db():
@@ -78,3 +326,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_only_db():
+    """Get a read-only database session."""
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
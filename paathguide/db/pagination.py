@@ -0,0 +1,89 @@
+"""Keyset pagination of verses in reading order, with opaque cursors."""
+
+import base64
+import json
+from typing import NamedTuple
+
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+from sqlalchemy.orm import Query
+
+from paathguide.db import models
+
+# Reading order. SQLite sorts NULL first, so lines without a page or line number lead
+READING_ORDER = (models.Verse.page_number, models.Verse.line_number, models.Verse.id)
+
+
+class InvalidCursor(ValueError):
+    """A cursor that wasn't returned by this API."""
+
+
+class Page(NamedTuple):
+    """One page of verses and what the client needs to ask for the next one."""
+
+    verses: list[models.Verse]
+    total: int
+    total_is_estimate: bool
+    next_cursor: str | None
+
+
+def encode_cursor(verse: models.Verse) -> str:
+    """Cursor pointing just past `verse` in reading order."""
+    key = json.dumps([verse.page_number, verse.line_number, verse.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int | None, int | None, int]:
+    """
+    The (page_number, line_number, id) key a cursor points past.
+
+    Raises:
+        InvalidCursor: If `cursor` wasn't produced by `encode_cursor`
+    """
+    try:
+        page, line, verse_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+    if not all(value is None or type(value) is int for value in (page, line)) or type(verse_id) is not int:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+    return page, line, verse_id
+
+
+def after(key: tuple[int | None, int | None, int]) -> ColumnElement[bool]:
+    """Filter for the verses that come after `key` in reading order."""
+    page, line, verse_id = key
+    if page is not None and line is not None:
+        # A row-value comparison lets SQLite seek the (page_number, line_number) index straight to the key
+        return tuple_(*READING_ORDER) > tuple_(page, line, verse_id)
+    return _after(list(zip(READING_ORDER, key, strict=True)))
+
+
+def _after(pairs: list) -> ColumnElement[bool]:
+    (column, value), *rest = pairs
+    if not rest:
+        return column > value
+    tail = _after(rest)
+    if value is None:
+        # NULL sorts first: any non-NULL value comes after it
+        return or_(column.isnot(None), and_(column.is_(None), tail))
+    return or_(column > value, and_(column == value, tail))
+
+
+def paginate(query: Query, cursor: str | None, limit: int) -> tuple[list[models.Verse], str | None]:
+    """
+    One page of `query` in reading order, starting after `cursor`.
+
+    Each page is an index seek plus `limit` rows, however deep into the
+    results it is, so walking all of them is linear overall.
+
+    Returns:
+        The verses, and the cursor for the next page (None on the last page)
+
+    Raises:
+        InvalidCursor: If `cursor` wasn't returned by this API
+    """
+    if cursor:
+        query = query.filter(after(decode_cursor(cursor)))
+    verses = query.order_by(*READING_ORDER).limit(limit + 1).all()
+    if len(verses) <= limit:
+        return verses, None
+    return verses[:limit], encode_cursor(verses[limit - 1])
@@ -1,9 +1,36 @@
 """Database operations and CRUD functions."""
 
-from sqlalchemy import and_, distinct, func
-from sqlalchemy.orm import Session
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date
+import itertools
+from typing import Any
 
+from sqlalchemy import and_, distinct, func, insert, literal_column, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from paathguide.corpus import corpus_cache
 from paathguide.db import models, schemas
+from paathguide.db.pagination import Page, paginate
+from paathguide.db.sampling import verse_sampler
+from paathguide.result_cache import QueryResultCache
+
+# Counts of verses matching a set of filters, reused as the `total` of later pages
+# until the corpus changes (in this process) or they expire
+_count_cache = QueryResultCache(max_entries=256, ttl_seconds=60.0)
+
+# /stats fields counting verses with the column set, and counting the column's distinct values
+_PRESENT_STATS = {
+    "verses_with_translations": models.Verse.translation,
+    "verses_with_transliterations": models.Verse.transliteration,
+}
+_DISTINCT_STATS = {
+    "total_pages": models.Verse.page_number,
+    "unique_raags": models.Verse.raag,
+    "unique_authors": models.Verse.author,
+}
+# Writes touching more verses than this recompute the stats instead of patching them
+_STATS_PATCH_LIMIT = 5000
 
 
 class VerseRepository:
@@ -16,8 +43,12 @@ class VerseRepository:
         """Create a new verse."""
         db_verse = models.Verse(**verse.model_dump())
         self.db.add(db_verse)
+        self.db.flush()
+        self._place_in_reading_order(db_verse)
+        self._update_stats(removed=[], added={db_verse.id: _stats_facts(db_verse)})
         self.db.commit()
         self.db.refresh(db_verse)
+        corpus_cache.upsert([db_verse])
         return db_verse
 
     def get_verse(self, verse_id: int) -> models.Verse | None:
@@ -36,13 +67,93 @@ class VerseRepository:
         """Get verses with pagination."""
         return self.db.query(models.Verse).offset(skip).limit(limit).all()
 
+    def list_verses(self, cursor: str | None = None, limit: int = 20, include_total: bool = False) -> Page:
+        """
+        Get a page of verses in reading order, starting after `cursor`.
+
+        `total` is read from the materialized stats row, which every write keeps
+        in step, so listing never counts the table; `include_total` counts it anyway.
+
+        Raises:
+            InvalidCursor: If `cursor` wasn't returned by a previous page
+        """
+        db_query = self.db.query(models.Verse)
+        verses, next_cursor = paginate(db_query, cursor, limit)
+        total = db_query.count() if include_total else self._stats_row().total_verses
+        return Page(verses, total, False, next_cursor)
+
     def search_verses(self, query: schemas.VerseSearchQuery) -> tuple[list[models.Verse], int]:
-        """Search verses based on query parameters."""
+        """
+        Search verses based on query parameters.
+
+        Text is matched as a substring. Queries of 3+ characters go through the
+        full-text index and come back best match first; shorter ones (or a
+        database without the index) are filtered with LIKE, in id order.
+        """
+        db_query, indexed = self._search_query(query)
+
+        # Get total count before pagination (and before ranking, which counting doesn't need)
+        total = db_query.count()
+
+        if indexed:
+            db_query = db_query.order_by(models.verses_fts.c.rank, models.Verse.id)
+
+        # Apply pagination
+        verses = db_query.offset(query.offset).limit(query.limit).all()
+
+        return verses, total
+
+    def search_verses_page(self, query: schemas.VerseSearchQuery) -> Page:
+        """
+        Search verses like `search_verses`, paging as the query asks.
+
+        With `order="reading"` (or a `cursor`) results come in reading order and
+        each page carries the cursor for the next; otherwise best match first,
+        paged by `offset`. `total` is exact with `include_total`, else the last
+        count seen for the same filters, if still fresh.
+
+        Raises:
+            InvalidCursor: If `query.cursor` wasn't returned by a previous page
+        """
+        db_query, indexed = self._search_query(query)
+        total, estimated = self._count(
+            db_query, ("search", query.query, query.page_number, query.raag, query.author), query.include_total
+        )
+
+        if query.order == "reading" or query.cursor:
+            verses, next_cursor = paginate(db_query, query.cursor, query.limit)
+            return Page(verses, total, estimated, next_cursor)
+
+        if indexed:
+            db_query = db_query.order_by(models.verses_fts.c.rank, models.Verse.id)
+        return Page(db_query.offset(query.offset).limit(query.limit).all(), total, estimated, None)
+
+    def _count(self, db_query, key: tuple, exact: bool) -> tuple[int, bool]:
+        """Rows matched by `db_query`, and whether that number came from the count cache."""
+        version = corpus_cache.version
+        if not exact:
+            cached = _count_cache.get(key, version)
+            if cached is not None:
+                return cached, True
+        total = db_query.count()
+        _count_cache.put(key, version, total)
+        return total, False
+
+    def _search_query(self, query: schemas.VerseSearchQuery):
+        """Verses matching the query's text and filters, and whether the full-text index is used."""
         db_query = self.db.query(models.Verse)
+        indexed = False
 
         # Text search
         if query.query:
-            db_query = db_query.filter(models.Verse.gurmukhi_text.contains(query.query))
+            indexed = self._uses_search_index(query.query)
+            if indexed:
+                fts = models.verses_fts
+                db_query = db_query.join(fts, fts.c.rowid == models.Verse.id).filter(
+                    fts.c.gurmukhi_text.op("MATCH")(_phrase(query.query))
+                )
+            else:
+                db_query = db_query.filter(models.Verse.gurmukhi_text.contains(query.query, autoescape=True))
 
         # Filters
         if query.page_number:
@@ -54,13 +165,31 @@ class VerseRepository:
         if query.author:
             db_query = db_query.filter(models.Verse.author == query.author)
 
-        # Get total count before pagination
-        total = db_query.count()
+        return db_query, indexed
 
-        # Apply pagination
-        verses = db_query.offset(query.offset).limit(query.limit).all()
+    def search_snippets(self, text: str, verses: list[models.Verse]) -> list[str]:
+        """
+        Highlight `text` in each of `verses` (as found by `search_verses`), marking matches with [ and ].
 
-        return verses, total
+        Long lines are cut to the part around the match, with … where text was left out.
+        """
+        if not verses or not text:
+            return [verse.gurmukhi_text for verse in verses]
+        if not self._uses_search_index(text):
+            return [verse.gurmukhi_text.replace(text, f"[{text}]") for verse in verses]
+
+        fts = models.verses_fts
+        rows = self.db.execute(
+            select(fts.c.rowid, func.snippet(literal_column("verses_fts"), 0, "[", "]", "…", 64)).where(
+                fts.c.gurmukhi_text.op("MATCH")(_phrase(text)), fts.c.rowid.in_([verse.id for verse in verses])
+            )
+        )
+        snippets = dict(rows.all())
+        return [snippets.get(verse.id, verse.gurmukhi_text) for verse in verses]
+
+    def _uses_search_index(self, text: str) -> bool:
+        """Whether a search for `text` can be answered by the full-text index."""
+        return len(text) >= models.SEARCH_INDEX_MIN_QUERY and models.search_index_exists(self.db.connection())
 
     def get_page_content(self, page_number: int) -> list[models.Verse]:
         """Get all verses from a specific page."""
@@ -72,29 +201,68 @@ class VerseRepository:
         )
 
     def get_surrounding_verses(self, verse_id: int, context: int = 3) -> list[models.Verse]:
-        """Get verses around a specific verse for context."""
-        verse = self.get_verse(verse_id)
-        if not verse or verse.line_number is None:
-            return []
+        """Get the `context` verses before and after a verse in reading order, across page boundaries."""
+        anchor = aliased(models.Verse)
+        seq = models.Verse.seq
+        around = self.db.query(models.Verse).join(anchor, anchor.id == verse_id)
+        # seq has gaps, so neighbours are counted off the index rather than computed
+        before = around.filter(seq < anchor.seq).order_by(seq.desc()).limit(context).all()
+        after = around.filter(seq >= anchor.seq).order_by(seq).limit(context + 1).all()
+        return before[::-1] + after
 
-        min_line = max(1, verse.line_number - context) # type: ignore
-        max_line = verse.line_number + context
+    def get_adjacent_verse(self, verse_id: int, step: int = 1) -> models.Verse | None:
+        """Get the verse `step` places after a verse in reading order (before it if negative)."""
+        anchor = aliased(models.Verse)
+        seq = models.Verse.seq
+        query = self.db.query(models.Verse).join(anchor, anchor.id == verse_id)
+        if step > 0:
+            query = query.filter(seq > anchor.seq).order_by(seq).offset(step - 1)
+        elif step < 0:
+            query = query.filter(seq < anchor.seq).order_by(seq.desc()).offset(-step - 1)
+        else:
+            query = query.filter(seq == anchor.seq)
+        return query.first()
 
-        return (
-            self.db.query(models.Verse)
-            .filter(
-                and_(
-                    models.Verse.page_number == verse.page_number,
-                    models.Verse.line_number.between(min_line, max_line),
-                )
-            )
-            .order_by(models.Verse.line_number)
-            .all()
-        )
+    def renumber_reading_order(self) -> None:
+        """Recompute every verse's `seq`, in the current transaction (after bulk loads)."""
+        models.renumber_reading_order(self.db.connection())
 
-    def get_random_verse(self) -> models.Verse | None:
-        """Get a random verse."""
-        return self.db.query(models.Verse).order_by(func.random()).first()
+    def _place_in_reading_order(self, verse: models.Verse) -> None:
+        """
+        Give a just-inserted verse a `seq` between its neighbours in reading order.
+
+        Only the verse itself is written, unless its neighbours' numbers are
+        adjacent; then the whole reading order is renumbered `SEQ_GAP` apart.
+        """
+        if verse.page_number is None or verse.line_number is None:
+            return
+        v = models.Verse
+        key, here = tuple_(v.page_number, v.line_number, v.id), tuple_(verse.page_number, verse.line_number, verse.id)
+        numbered = select(v.seq).where(v.seq.isnot(None)).limit(1)
+        previous = self.db.scalar(numbered.where(key < here).order_by(v.page_number.desc(), v.line_number.desc(), v.id.desc())) or 0
+        following = self.db.scalar(numbered.where(key > here).order_by(v.page_number, v.line_number, v.id))
+
+        if following is None:
+            verse.seq = previous + models.SEQ_GAP
+        elif following - previous > 1:
+            verse.seq = (previous + following) // 2
+        else:
+            self.renumber_reading_order()
+            self.db.refresh(verse, ["seq"])
+            return
+        self.db.flush()
+
+    def get_random_verse(self, seed: int | str | None = None) -> models.Verse | None:
+        """Get a random verse; a given `seed` always picks the same one while the verses don't change."""
+        return verse_sampler.pick(self.db, seed)
+
+    def get_hukamnama(self, day: date) -> tuple[models.Verse, list[models.Verse]] | None:
+        """The verse picked for `day`, with every verse on its page (or just itself if it has no page)."""
+        verse = self.get_random_verse(seed=f"hukamnama:{day.isoformat()}")
+        if verse is None:
+            return None
+        page = self.get_page_content(verse.page_number) if verse.page_number is not None else [verse]
+        return verse, page
 
     def update_verse(self, verse_id: int, verse_update: schemas.VerseUpdate) -> models.Verse | None:
         """Update a verse."""
@@ -102,12 +270,16 @@ class VerseRepository:
         if not db_verse:
             return None
 
+        before = _stats_facts(db_verse)
         update_data = verse_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_verse, field, value)
 
+        self.db.flush()
+        self._update_stats(removed=[before], added={db_verse.id: _stats_facts(db_verse)})
         self.db.commit()
         self.db.refresh(db_verse)
+        corpus_cache.upsert([db_verse])
         return db_verse
 
     def delete_verse(self, verse_id: int) -> bool:
@@ -116,41 +288,227 @@ class VerseRepository:
         if not db_verse:
             return False
 
+        before = _stats_facts(db_verse)
         self.db.delete(db_verse)
+        self.db.flush()
+        self._update_stats(removed=[before], added={})
         self.db.commit()
+        corpus_cache.remove([verse_id])
         return True
 
     def get_stats(self) -> schemas.StatsResponse:
-        """Get database statistics."""
-        total_verses = self.db.query(models.Verse).count()
-        total_pages = self.db.query(distinct(models.Verse.page_number)).count()
-        verses_with_translations = (
-            self.db.query(models.Verse).filter(models.Verse.translation.isnot(None)).count()
-        )
-        verses_with_transliterations = (
-            self.db.query(models.Verse).filter(models.Verse.transliteration.isnot(None)).count()
-        )
-        unique_raags = (
-            self.db.query(distinct(models.Verse.raag)).filter(models.Verse.raag.isnot(None)).count()
-        )
-        unique_authors = (
-            self.db.query(distinct(models.Verse.author))
-            .filter(models.Verse.author.isnot(None))
-            .count()
-        )
+        """Get database statistics from the materialized stats row."""
+        stats = self._stats_row()
+        return schemas.StatsResponse(**{field: getattr(stats, field) for field in schemas.StatsResponse.model_fields})
 
-        return schemas.StatsResponse(
-            total_verses=total_verses,
-            total_pages=total_pages,
-            verses_with_translations=verses_with_translations,
-            verses_with_transliterations=verses_with_transliterations,
-            unique_raags=unique_raags,
-            unique_authors=unique_authors,
-        )
+    def _stats_row(self) -> models.CorpusStats:
+        """The materialized stats row as last committed, computing it on first use."""
+        stats = self.db.scalars(
+            select(models.CorpusStats).where(models.CorpusStats.id == 1).execution_options(populate_existing=True)
+        ).first()
+        if stats is None:
+            stats = self.refresh_stats()
+            self.db.commit()
+        return stats
+
+    def refresh_stats(self) -> models.CorpusStats:
+        """Recompute the materialized stats with one aggregate query, in the current transaction."""
+        aggregates = {
+            "total_verses": func.count(),
+            **{field: func.count(column) for field, column in _PRESENT_STATS.items()},
+            **{field: func.count(distinct(column)) for field, column in _DISTINCT_STATS.items()},
+        }
+        row = self.db.execute(select(*aggregates.values())).one()
+
+        stats = self.db.get(models.CorpusStats, 1) or models.CorpusStats(id=1)
+        for field, value in zip(aggregates, row, strict=True):
+            setattr(stats, field, value)
+        stats.updated_at = models.utc_now()  # set even when the counts come out the same
+        self.db.add(stats)
+        self.db.flush()
+        return stats
+
+    def _update_stats(self, removed: list[dict[str, Any]], added: dict[int, dict[str, Any]]) -> None:
+        """
+        Patch the materialized stats for a write that has been flushed but not committed.
+
+        `removed` holds the stats columns of verses as they were before the write
+        (deleted, or before an update) and `added` those of inserted or updated
+        verses, by id. Distinct counts are checked with indexed lookups of just
+        the values involved, so a write costs O(verses written), not a table scan.
+        """
+        if len(removed) + len(added) > _STATS_PATCH_LIMIT or self.db.get(models.CorpusStats, 1) is None:
+            self.refresh_stats()
+            return
+
+        deltas = {"total_verses": len(added) - len(removed)}
+        for field, column in _PRESENT_STATS.items():
+            deltas[field] = sum(facts[column.key] is not None for facts in added.values()) - sum(
+                facts[column.key] is not None for facts in removed
+            )
+        for field, column in _DISTINCT_STATS.items():
+            old = {facts[column.key] for facts in removed} - {None}
+            new = {facts[column.key] for facts in added.values()} - {None}
+            old, new = old - new, new - old
+            if old:
+                # Values no verse has any more
+                old -= set(self.db.scalars(select(column).distinct().where(column.in_(old))))
+            if new:
+                # Values no other verse had yet
+                new -= set(
+                    self.db.scalars(select(column).distinct().where(column.in_(new), models.Verse.id.not_in(added)))
+                )
+            deltas[field] = len(new) - len(old)
 
-    def bulk_create_verses(self, verses: list[schemas.VerseCreate]) -> list[models.Verse]:
-        """Create multiple verses efficiently."""
+        stats = models.CorpusStats
+        changes = {getattr(stats, field): getattr(stats, field) + delta for field, delta in deltas.items() if delta}
+        # Incremented in SQL, so concurrent writers can't lose each other's updates. updated_at
+        # moves on every write, counts changed or not: corpus snapshots are checked against it
+        changes[stats.updated_at] = models.utc_now()
+        self.db.execute(update(stats).where(stats.id == 1).values(changes).execution_options(synchronize_session=False))
+
+    def bulk_create_verses(self, verses: list[schemas.VerseCreate], renumber: bool = True) -> list[models.Verse]:
+        """
+        Create multiple verses efficiently.
+
+        Args:
+            verses: Verses to insert
+            renumber: Recompute the reading order afterwards. Loaders inserting many
+                batches pass False and call `renumber_reading_order` once at the end.
+        """
         db_verses = [models.Verse(**verse.model_dump()) for verse in verses]
         self.db.add_all(db_verses)
+        self.db.flush()
+        if renumber:
+            self.renumber_reading_order()
+        self._update_stats(removed=[], added={verse.id: _stats_facts(verse) for verse in db_verses})
         self.db.commit()
+        # Cheaper to rebuild lazily than to refresh every expired row for a patch
+        corpus_cache.invalidate()
         return db_verses
+
+    def bulk_insert_lines(
+        self, lines: Iterable[models.VerseLine], batch_size: int = 10000, progress: Callable[[int], None] | None = None
+    ) -> int:
+        """
+        Insert (gurmukhi_text, page_number, line_number) tuples in a single transaction.
+
+        The fast path for loading the whole text: rows go straight to a Core
+        executemany with no Pydantic or ORM objects, and the full-text index,
+        reading order and stats are each brought up to date once at the end
+        instead of row by row. Nothing is committed until every batch is in;
+        roll the session back if this raises.
+
+        `lines` is consumed one batch at a time, so a generator is never held in
+        memory as a whole. A list loaded into an empty table also gets its
+        reading order assigned on the way in, saving the renumbering pass.
+
+        Args:
+            lines: Rows to insert
+            batch_size: Rows per executemany
+            progress: Called with the number of rows inserted so far after each batch
+
+        Returns:
+            Number of verses inserted
+        """
+        statement = insert(models.Verse.__table__)
+        created_at = models.utc_now()
+        inserted = 0
+        connection = self.db.connection()
+        positions = None
+        if isinstance(lines, Sequence) and self.db.scalar(select(models.Verse.id).limit(1)) is None:
+            # Into an empty table ids follow insertion order, so the reading order is known up front
+            positions = iter(_reading_positions(lines))
+        with models.search_index_deferred(connection):
+            for batch in itertools.batched(lines, batch_size):
+                rows = [{"gurmukhi_text": text, "page_number": page, "line_number": line, "created_at": created_at} for text, page, line in batch]
+                if positions is not None:
+                    for row in rows:
+                        row["seq"] = next(positions)
+                connection.execute(statement, rows)
+                inserted += len(batch)
+                if progress is not None:
+                    progress(inserted)
+        if positions is None:
+            self.renumber_reading_order()
+        self.refresh_stats()
+        self.db.commit()
+        corpus_cache.invalidate()
+        return inserted
+
+
+class AsyncVerseRepository:
+    """
+    Read side of VerseRepository over an AsyncSession, for the async endpoints.
+
+    Each method runs the VerseRepository method of the same name on the session's
+    sync facade, so the queries are the same and a request waiting on the database
+    holds no threadpool worker. Writes go through VerseRepository.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return await self.db.run_sync(lambda session: getattr(VerseRepository(session), method)(*args, **kwargs))
+
+    async def get_verse(self, verse_id: int) -> models.Verse | None:
+        return await self._run("get_verse", verse_id)
+
+    async def get_verse_by_page_line(self, page: int, line: int) -> models.Verse | None:
+        return await self._run("get_verse_by_page_line", page, line)
+
+    async def get_verses(self, skip: int = 0, limit: int = 20) -> list[models.Verse]:
+        return await self._run("get_verses", skip, limit)
+
+    async def list_verses(self, cursor: str | None = None, limit: int = 20, include_total: bool = False) -> Page:
+        return await self._run("list_verses", cursor, limit, include_total)
+
+    async def search_verses(self, query: schemas.VerseSearchQuery) -> tuple[list[models.Verse], int]:
+        return await self._run("search_verses", query)
+
+    async def search_verses_page(self, query: schemas.VerseSearchQuery) -> Page:
+        return await self._run("search_verses_page", query)
+
+    async def search_snippets(self, text: str, verses: list[models.Verse]) -> list[str]:
+        return await self._run("search_snippets", text, verses)
+
+    async def get_page_content(self, page_number: int) -> list[models.Verse]:
+        return await self._run("get_page_content", page_number)
+
+    async def get_surrounding_verses(self, verse_id: int, context: int = 3) -> list[models.Verse]:
+        return await self._run("get_surrounding_verses", verse_id, context)
+
+    async def get_adjacent_verse(self, verse_id: int, step: int = 1) -> models.Verse | None:
+        return await self._run("get_adjacent_verse", verse_id, step)
+
+    async def get_random_verse(self, seed: int | str | None = None) -> models.Verse | None:
+        return await self._run("get_random_verse", seed)
+
+    async def get_hukamnama(self, day: date) -> tuple[models.Verse, list[models.Verse]] | None:
+        return await self._run("get_hukamnama", day)
+
+    async def get_stats(self) -> schemas.StatsResponse:
+        return await self._run("get_stats")
+
+
+def _reading_positions(lines: Sequence[models.VerseLine]) -> list[int | None]:
+    """The `seq` each line gets when they are inserted, in order, into an empty table."""
+    numbered = sorted(
+        (index for index, (_, page, line) in enumerate(lines) if page is not None and line is not None),
+        key=lambda index: (lines[index][1], lines[index][2], index),
+    )
+    positions: list[int | None] = [None] * len(lines)
+    for seq, index in enumerate(numbered, start=1):
+        positions[index] = seq * models.SEQ_GAP
+    return positions
+
+
+def _stats_facts(verse: models.Verse) -> dict[str, Any]:
+    """The columns of `verse` that /stats counts."""
+    return {column.key: getattr(verse, column.key) for column in (*_PRESENT_STATS.values(), *_DISTINCT_STATS.values())}
+
+
+def _phrase(text: str) -> str:
+    """`text` as an FTS5 phrase, so it is matched literally rather than parsed as a query."""
+    return '"' + text.replace('"', '""') + '"'
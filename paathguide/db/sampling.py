@@ -0,0 +1,71 @@
+"""Constant-time random (or seeded) verse selection."""
+
+from array import array
+import random
+import threading
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from paathguide.corpus import corpus_cache
+from paathguide.db import models
+
+
+class VerseSampler:
+    """
+    Picks verses uniformly at random, or deterministically from a seed.
+
+    Verse ids are kept in a dense array, so a pick is one index into it plus a
+    primary-key lookup. The array is the fuzzy search corpus's own when that is
+    loaded, and otherwise a one-off `SELECT id`; either way it is replaced once
+    the corpus version moves on. If the picked id has since been deleted
+    (e.g. by another process), the pick falls back to probing a random point
+    in the rowid range, which needs no array at all.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = array("q")
+        self._version: int | None = None
+
+    def pick(self, db: Session, seed: int | str | None = None) -> models.Verse | None:
+        """
+        A random verse, or None if there are none.
+
+        The same `seed` picks the same verse for as long as the set of verses is unchanged.
+        """
+        rng = random.Random(seed) if seed is not None else random
+        ids = self._current_ids(db)
+        if ids:
+            verse = db.get(models.Verse, ids[rng.randrange(len(ids))])
+            if verse is not None:
+                return verse
+        return self._probe(db, rng)
+
+    def _current_ids(self, db: Session) -> array:
+        version = corpus_cache.version
+        if self._version == version:
+            return self._ids
+
+        store = corpus_cache.current
+        if store is not None and store.version == version:
+            # The store is in reading order; sort so a seed picks the same verse from either source
+            ids = array("q", sorted(store.ids))
+        else:
+            ids = array("q", db.scalars(select(models.Verse.id).order_by(models.Verse.id)))
+        with self._lock:
+            if corpus_cache.version == version:
+                self._ids, self._version = ids, version
+        return ids
+
+    def _probe(self, db: Session, rng) -> models.Verse | None:
+        """First verse at or after a random id between the smallest and largest; verses after gaps are favoured."""
+        low, high = db.execute(select(func.min(models.Verse.id), func.max(models.Verse.id))).one()
+        if low is None:
+            return None
+        target = rng.randint(low, high)
+        return db.scalars(select(models.Verse).where(models.Verse.id >= target).order_by(models.Verse.id).limit(1)).first()
+
+
+# Shared by every VerseRepository in this process
+verse_sampler = VerseSampler()
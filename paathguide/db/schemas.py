@@ -1,6 +1,7 @@
 """Pydantic schemas for API request/response models."""
 
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -38,6 +39,7 @@ class Verse(VerseBase):
 
     id: int
     created_at: datetime
+    seq: int | None = Field(None, description="Sort key for reading order across the whole text; values are spaced apart, so compare rather than count them")
 
     class Config:
         from_attributes = True
@@ -52,6 +54,12 @@ class VerseSearchQuery(BaseModel):
     author: str | None = Field(None, description="Filter by author")
     limit: int = Field(default=20, le=100, description="Maximum results to return")
     offset: int = Field(default=0, ge=0, description="Number of results to skip")
+    highlight: bool = Field(default=False, description="Also return each verse's text with the matches marked by [ and ]")
+    order: Literal["rank", "reading"] = Field(
+        default="rank", description="Best match first (paged by offset), or reading order (paged by cursor)"
+    )
+    cursor: str | None = Field(default=None, description="next_cursor of the previous page; implies reading order")
+    include_total: bool = Field(default=False, description="Count the matches exactly instead of reusing a recent count")
 
 
 class SearchResponse(BaseModel):
@@ -61,6 +69,18 @@ class SearchResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    snippets: list[str] | None = Field(default=None, description="Highlighted text of each verse, in the same order (with highlight)")
+    total_is_estimate: bool = Field(default=False, description="total is a recent count that may be slightly stale")
+    next_cursor: str | None = Field(default=None, description="Pass as cursor to get the next page (reading order only)")
+
+
+class VerseListResponse(BaseModel):
+    """Schema for a page of verses in reading order."""
+
+    verses: list[Verse]
+    total: int
+    total_is_estimate: bool = Field(description="total is a recent count that may be slightly stale")
+    next_cursor: str | None = Field(description="Pass as cursor to get the next page; null on the last page")
 
 
 class PageResponse(BaseModel):
@@ -71,6 +91,15 @@ class PageResponse(BaseModel):
     total_lines: int
 
 
+class HukamnamaResponse(BaseModel):
+    """Schema for the verse of the day with its page."""
+
+    date: date
+    verse: Verse
+    page_number: int | None
+    page_verses: list[Verse] = Field(description="Every verse on the same page, in line order")
+
+
 class StatsResponse(BaseModel):
     """Schema for database statistics."""
 
@@ -89,6 +118,28 @@ class FuzzySearchRequest(BaseModel):
     score_cutoff: float = Field(default=60.0, ge=0.0, le=100.0, description="Minimum similarity score")
     ratio_type: str = Field(default="WRatio", description="Fuzzy matching algorithm")
     clean_text: bool = Field(default=True, description="Apply text preprocessing")
+    max_span: int = Field(default=1, ge=1, le=8, description="Match across up to this many consecutive lines")
+
+
+class FuzzyFollowRequest(BaseModel):
+    """Schema for follow-mode search, which looks near the last matched verse first."""
+    query_text: str = Field(..., description="Text to search for")
+    last_verse_id: int | None = Field(default=None, description="Verse matched by the previous utterance")
+    session_id: str | None = Field(default=None, max_length=128, description="Let the server remember the last match for this session")
+    limit: int = Field(default=10, ge=1, le=50, description="Maximum number of results")
+    score_cutoff: float = Field(default=60.0, ge=0.0, le=100.0, description="Minimum similarity score")
+    ratio_type: str = Field(default="WRatio", description="Fuzzy matching algorithm")
+    clean_text: bool = Field(default=True, description="Apply text preprocessing")
+    confidence: float = Field(default=85.0, ge=0.0, le=100.0, description="Local score needed to skip the global search")
+
+
+class FuzzyBatchSearchRequest(BaseModel):
+    """Schema for scoring many queries in one request."""
+    queries: list[str] = Field(..., min_length=1, max_length=100, description="Texts to search for")
+    limit: int = Field(default=10, ge=1, le=50, description="Maximum number of results per query")
+    score_cutoff: float = Field(default=60.0, ge=0.0, le=100.0, description="Minimum similarity score")
+    ratio_type: str = Field(default="WRatio", description="Fuzzy matching algorithm")
+    clean_text: bool = Field(default=True, description="Apply text preprocessing")
 
 
 class FuzzySearchResult(BaseModel):
@@ -96,6 +147,7 @@ class FuzzySearchResult(BaseModel):
     verse: Verse
     score: float = Field(..., description="Similarity score (0-100)")
     ratio_type: str = Field(..., description="Fuzzy matching algorithm used")
+    span: int = Field(default=1, description="Number of consecutive lines matched, starting at verse")
 
     class Config:
         from_attributes = True
@@ -109,6 +161,18 @@ class FuzzySearchResponse(BaseModel):
     search_params: dict
 
 
+class FuzzyFollowResponse(FuzzySearchResponse):
+    """Schema for follow-mode search response."""
+    matched_locally: bool = Field(..., description="Whether the match came from the window after the last verse")
+    session_id: str | None = None
+
+
+class FuzzyBatchSearchResponse(BaseModel):
+    """Schema for batch fuzzy search response, one entry per query in request order."""
+    results: list[FuzzySearchResponse]
+    total_queries: int
+
+
 class FuzzyComparisonResponse(BaseModel):
     """Schema for fuzzy comparison using multiple methods."""
     query_text: str
@@ -1,36 +1,108 @@
 """Fuzzy search functionality for SGGS verses."""
 
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from typing import Any
 
 from rapidfuzz import fuzz, process
 from sqlalchemy.orm import Session
 
+from paathguide.corpus import VerseStore, corpus_cache
 from paathguide.db import models
 from paathguide.db.repository import VerseRepository
+from paathguide.result_cache import QueryResultCache, query_result_cache
 from paathguide.text_cleaner import WhisperTextCleaner
 
 
 class FuzzySearchResult:
-    """Result of a fuzzy search operation."""
+    """
+    Result of a fuzzy search operation.
 
-    def __init__(self, verse: models.Verse, score: float, ratio_type: str):
-        self.verse = verse
+    Scoring only produces the verse id; `verse` is filled in afterwards for the
+    results that are actually returned.
+    """
+
+    __slots__ = ("verse_id", "score", "ratio_type", "span", "verse")
+
+    def __init__(self, verse_id: int, score: float, ratio_type: str, span: int = 1, verse: models.Verse | None = None):
+        self.verse_id = verse_id
         self.score = score
         self.ratio_type = ratio_type
+        self.span = span  # consecutive lines matched, starting at verse_id
+        self.verse = verse
+
+
+class FollowSessions:
+    """Last matched verse per client session, for follow-mode search (bounded LRU)."""
+
+    def __init__(self, max_sessions: int = 10_000):
+        self.max_sessions = max_sessions
+        self._last_verse: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> int | None:
+        with self._lock:
+            verse_id = self._last_verse.get(session_id)
+            if verse_id is not None:
+                self._last_verse.move_to_end(session_id)
+            return verse_id
+
+    def set(self, session_id: str, verse_id: int) -> None:
+        with self._lock:
+            self._last_verse[session_id] = verse_id
+            self._last_verse.move_to_end(session_id)
+            while len(self._last_verse) > self.max_sessions:
+                self._last_verse.popitem(last=False)
+
+
+# Shared by the API so a client only has to send its session id
+follow_sessions = FollowSessions()
 
 
 class SGGSFuzzySearcher:
     """Fuzzy search functionality for SGGS verses."""
 
+    # Rows shortlisted by the n-gram index before rapidfuzz rescoring
+    CANDIDATE_LIMIT = 300
+    # Fewer anchors for multi-line search: each one expands into several windows
+    WINDOW_CANDIDATE_LIMIT = 100
+    # Queries per full-corpus cdist call in find_closest_matches_many, bounding the score matrix
+    BATCH_SIZE = 32
+    # Follow mode: lines around the last match scored before falling back to a global search
+    FOLLOW_LINES_BEHIND = 2
+    FOLLOW_LINES_AHEAD = 40
+    FOLLOW_CONFIDENCE = 85.0
+    # Scorers reported side by side by compare_with_multiple_methods
+    COMPARISON_METHODS = ("ratio", "partial_ratio", "token_sort_ratio", "token_set_ratio", "WRatio")
+
     def __init__(self, db: Session):
         self.db = db
         self.repo = VerseRepository(db)
         self.text_cleaner = WhisperTextCleaner()
-
-    def _get_all_verses_text(self) -> dict[str, models.Verse]:
-        """Get all verses as a dictionary mapping text to verse objects."""
-        verses = self.db.query(models.Verse).all()
-        return {str(verse.gurmukhi_text): verse for verse in verses}
+        self.result_cache: QueryResultCache | None = query_result_cache
+
+    def _get_corpus(self) -> VerseStore:
+        """Get the shared in-memory corpus, loading it from the database only on first use."""
+        return corpus_cache.get(self.db, self.text_cleaner)
+
+    def _hydrate(self, results: list[FuzzySearchResult]) -> list[FuzzySearchResult]:
+        """Attach full Verse rows to the results with a single primary-key lookup."""
+        missing = {result.verse_id for result in results if result.verse is None}
+        if missing:
+            verses = self.db.query(models.Verse).filter(models.Verse.id.in_(missing)).all()
+            by_id = {verse.id: verse for verse in verses}
+            for result in results:
+                if result.verse is None:
+                    result.verse = by_id.get(result.verse_id)
+        # A verse deleted between scoring and hydration simply drops out
+        return [result for result in results if result.verse is not None]
+
+    def _hydrate_groups(self, groups: list[list[FuzzySearchResult]]) -> list[list[FuzzySearchResult]]:
+        """Hydrate several result lists with one lookup, keeping each list's order."""
+        kept = {id(result) for result in self._hydrate([result for results in groups for result in results])}
+        return [[result for result in results if id(result) in kept] for results in groups]
 
     def find_closest_matches(
         self,
@@ -38,44 +110,332 @@ class SGGSFuzzySearcher:
         limit: int = 10,
         score_cutoff: float = 60.0,
         ratio_type: str = "WRatio",
+        normalized: bool = False,
+        use_index: bool = True,
     ) -> list[FuzzySearchResult]:
         """
         Find the closest matching verses using fuzzy string matching.
 
+        On a large corpus the character n-gram index first shortlists the
+        `CANDIDATE_LIMIT` lines sharing the most trigrams with the query, and
+        only those are scored.
+
         Args:
             query_text: The text to search for
             limit: Maximum number of results to return
             score_cutoff: Minimum similarity score (0-100)
             ratio_type: Type of ratio calculation ('ratio', 'partial_ratio', 'token_sort_ratio', 'WRatio')
+            normalized: Score against the cleaned corpus (use with an already cleaned query)
+            use_index: Shortlist candidates with the n-gram index instead of scoring every line
 
         Returns:
             List of FuzzySearchResult objects sorted by similarity score (highest first)
         """
-        verses_dict = self._get_all_verses_text()
+        corpus = self._get_corpus()
 
-        if not verses_dict:
+        if not corpus:
             return []
 
-        # Choose the appropriate fuzzy matching function
-        ratio_func = self._get_ratio_function(ratio_type)
+        rows = self._candidate_rows(corpus, query_text, normalized, max(self.CANDIDATE_LIMIT, limit)) if use_index else None
+        return self._hydrate(self._score_rows(corpus, query_text, rows, limit, score_cutoff, ratio_type, normalized))
+
+    def _score_rows(
+        self,
+        corpus: VerseStore,
+        query_text: str,
+        rows: Sequence[int] | None,
+        limit: int,
+        score_cutoff: float,
+        ratio_type: str,
+        normalized: bool,
+    ) -> list[FuzzySearchResult]:
+        """Best matches for `query_text` among `rows` (every row if None), not yet hydrated."""
+        texts = corpus.texts(normalized)
+        choices = texts if rows is None else {row: texts[row] for row in rows}
 
         # Use rapidfuzz's process.extract for efficient batch processing
         matches = process.extract(
             query_text,
-            verses_dict.keys(),
-            scorer=ratio_func,
+            choices,
+            scorer=self._get_ratio_function(ratio_type),
             limit=limit,
             score_cutoff=score_cutoff,
         )
 
         # Convert to FuzzySearchResult objects
+        return [FuzzySearchResult(verse_id=corpus.ids[row], score=score, ratio_type=ratio_type) for _, score, row in matches]
+
+    def _candidate_rows(self, corpus: VerseStore, query_text: str, normalized: bool, limit: int) -> list[int] | None:
+        """Rows shortlisted by the n-gram index, or None when every row should be scored."""
+        if len(corpus) <= limit:
+            return None
+        return corpus.ngram_index(normalized).candidates(query_text, limit) or None
+
+    def find_spanning_matches(
+        self,
+        query_text: str,
+        max_span: int = 4,
+        limit: int = 10,
+        score_cutoff: float = 60.0,
+        ratio_type: str = "WRatio",
+        normalized: bool = False,
+    ) -> list[FuzzySearchResult]:
+        """
+        Match a query that may cover several consecutive lines (e.g. a 15 second transcript).
+
+        The query is scored against windows of 1..`max_span` consecutive lines in
+        reading order, crossing page boundaries. Only windows whose length in
+        lines is close to the query's are tried, and only around rows the n-gram
+        index shortlists, so the cost stays close to a single-line search.
+
+        Args:
+            query_text: The text to search for
+            max_span: Longest window, in lines, to consider
+            limit: Maximum number of results to return
+            score_cutoff: Minimum similarity score (0-100)
+            ratio_type: Type of ratio calculation
+            normalized: Score against the cleaned corpus (use with an already cleaned query)
+
+        Returns:
+            Non-overlapping FuzzySearchResult objects, best first; `span` gives the window length
+        """
+        corpus = self._get_corpus()
+        if not corpus or not query_text:
+            return []
+
+        texts = corpus.texts(normalized)
+        mean_length = texts.mean_length() or 1.0
+        expected = min(max_span, max(1, round(len(query_text) / mean_length)))
+        spans = range(max(1, expected - 1), min(max_span, expected + 1) + 1)
+
+        rows = self._candidate_rows(corpus, query_text, normalized, self.WINDOW_CANDIDATE_LIMIT)
+        if rows is None:
+            rows = range(len(corpus))
+
+        # Every window of a plausible length that contains a shortlisted row
+        last_row = len(corpus)
+        windows = {}
+        for row in rows:
+            for span in spans:
+                for start in range(max(0, row - span + 1), min(row, last_row - span) + 1):
+                    if (start, span) not in windows:
+                        windows[start, span] = texts.span(start, span)
+
+        matches = process.extract(
+            query_text,
+            windows,
+            scorer=self._get_ratio_function(ratio_type),
+            limit=None,
+            score_cutoff=score_cutoff,
+        )
+
+        # Overlapping windows around the same passage score alike; keep the best of each
         results = []
-        for text, score, _ in matches:
-            verse = verses_dict[text]
-            result = FuzzySearchResult(verse=verse, score=score, ratio_type=ratio_type)
-            results.append(result)
+        covered: set[int] = set()
+        for _, score, (start, span) in matches:
+            window_rows = range(start, start + span)
+            if covered.intersection(window_rows):
+                continue
+            covered.update(window_rows)
+            results.append(FuzzySearchResult(verse_id=corpus.ids[start], score=score, ratio_type=ratio_type, span=span))
+            if len(results) == limit:
+                break
+
+        return self._hydrate(results)
+
+    def find_closest_matches_many(
+        self,
+        queries: list[str],
+        limit: int = 10,
+        score_cutoff: float = 60.0,
+        ratio_type: str = "WRatio",
+        clean_text: bool = True,
+        workers: int = 1,
+    ) -> list[list[FuzzySearchResult]]:
+        """
+        Search many queries with one corpus lookup and one hydration query.
 
-        return results
+        Each query is shortlisted by the n-gram index and scored against its own
+        shortlist, exactly as `find_closest_matches` would. Shortlists of
+        different lines hardly overlap, so scoring the batch against their union
+        in one cdist matrix costs about as many comparisons as there are queries
+        times the union (~10x more on the full text) and is not done. Queries
+        the index can't shortlist share full-corpus `rapidfuzz.process.cdist`
+        passes, `BATCH_SIZE` queries (and score rows) at a time.
+
+        Args:
+            queries: Texts to search for
+            limit: Maximum number of results per query
+            score_cutoff: Minimum similarity score (0-100)
+            ratio_type: Type of ratio calculation
+            clean_text: Clean each query and score it against the cleaned corpus
+            workers: Threads used by cdist (-1 = all cores); the search service already runs one search per worker process
+
+        Returns:
+            One list of FuzzySearchResult objects per query, in input order
+        """
+        if not queries:
+            return []
+
+        corpus = self._get_corpus()
+        if not corpus:
+            return [[] for _ in queries]
+
+        processed = [self.text_cleaner.clean_stt_output(query) for query in queries] if clean_text else list(queries)
+        per_query: list[list[FuzzySearchResult]] = [[] for _ in processed]
+        unlisted = []
+        for position, query in enumerate(processed):
+            rows = self._candidate_rows(corpus, query, clean_text, max(self.CANDIDATE_LIMIT, limit))
+            if rows is None:
+                unlisted.append(position)
+            else:
+                per_query[position] = self._score_rows(corpus, query, rows, limit, score_cutoff, ratio_type, clean_text)
+
+        if unlisted:
+            choices = list(corpus.texts(clean_text))
+            for start in range(0, len(unlisted), self.BATCH_SIZE):
+                batch = unlisted[start : start + self.BATCH_SIZE]
+                scores = process.cdist(
+                    [processed[position] for position in batch],
+                    choices,
+                    scorer=self._get_ratio_function(ratio_type),
+                    score_cutoff=score_cutoff,
+                    dtype="float64",  # same scores as the single-query path
+                    workers=workers,
+                )
+                for position, row_scores in zip(batch, scores, strict=True):
+                    per_query[position] = self._top_results(corpus, None, row_scores, limit, score_cutoff, ratio_type)
+
+        # One primary-key lookup for every query's hits
+        return self._hydrate_groups(per_query)
+
+    def _top_results(
+        self,
+        corpus: VerseStore,
+        rows: Sequence[int] | None,
+        row_scores: Any,
+        limit: int,
+        score_cutoff: float,
+        ratio_type: str,
+    ) -> list[FuzzySearchResult]:
+        """Best `limit` entries of one cdist score row; `rows` maps positions back to corpus rows."""
+        top = min(limit, len(row_scores))
+        if top == 0:
+            return []
+        # argpartition finds the top-k without sorting the whole row
+        best = row_scores.argpartition(-top)[-top:]
+        best = sorted(best, key=lambda position: (-row_scores[position], position))
+        return [
+            FuzzySearchResult(
+                verse_id=corpus.ids[position if rows is None else rows[position]],
+                score=float(row_scores[position]),
+                ratio_type=ratio_type,
+            )
+            for position in best
+            if row_scores[position] >= score_cutoff
+        ]
+
+    def _score_concurrently(
+        self, jobs: dict[str, tuple[str, bool, str]], limit: int, score_cutoff: float
+    ) -> dict[str, list[FuzzySearchResult]]:
+        """
+        Run several searches, given as name -> (query, normalized, ratio_type), in one pass.
+
+        The corpus is fetched once, each distinct query/column pair is shortlisted
+        once, and the scorers then run side by side on a thread pool (cdist
+        releases the GIL while scoring). All hits are hydrated in one query.
+        """
+        corpus = self._get_corpus()
+        if not corpus:
+            return {name: [] for name in jobs}
+
+        shortlists: dict[tuple[str, bool], tuple[Sequence[int], list[str]]] = {}
+        for query, normalized, _ in jobs.values():
+            if (query, normalized) not in shortlists:
+                texts = corpus.texts(normalized)
+                rows = self._candidate_rows(corpus, query, normalized, max(self.CANDIDATE_LIMIT, limit))
+                if rows is None:
+                    rows = range(len(corpus))
+                shortlists[query, normalized] = (rows, [texts[row] for row in rows])
+
+        def score(job: tuple[str, bool, str]) -> list[FuzzySearchResult]:
+            query, normalized, ratio_type = job
+            rows, choices = shortlists[query, normalized]
+            row_scores = process.cdist(
+                [query],
+                choices,
+                scorer=self._get_ratio_function(ratio_type),
+                score_cutoff=score_cutoff,
+                dtype="float64",
+                workers=1,
+            )[0]
+            return self._top_results(corpus, rows, row_scores, limit, score_cutoff, ratio_type)
+
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            scored = dict(zip(jobs, executor.map(score, jobs.values()), strict=True))
+
+        return dict(zip(scored, self._hydrate_groups(list(scored.values())), strict=True))
+
+    def follow(
+        self,
+        query_text: str,
+        last_verse_id: int | None,
+        limit: int = 10,
+        score_cutoff: float = 60.0,
+        ratio_type: str = "WRatio",
+        clean_text: bool = True,
+        confidence: float | None = None,
+    ) -> tuple[list[FuzzySearchResult], bool]:
+        """
+        Search near the reader's current position first, as during a live paath.
+
+        The lines just behind and the next couple of pages after `last_verse_id`
+        (in reading order, across page boundaries) are scored first; if the best
+        local score reaches `confidence` those results are returned straight away,
+        otherwise the global search runs. Steady-state cost is therefore a few
+        dozen comparisons rather than a pass over the corpus.
+
+        Args:
+            query_text: The text to search for
+            last_verse_id: Verse matched by the previous utterance, if any
+            limit: Maximum number of results
+            score_cutoff: Minimum similarity score (0-100)
+            ratio_type: Type of ratio calculation
+            clean_text: Whether to apply text cleaning
+            confidence: Local best score needed to skip the global search (default FOLLOW_CONFIDENCE)
+
+        Returns:
+            (results, matched_locally)
+        """
+        if confidence is None:
+            confidence = self.FOLLOW_CONFIDENCE
+
+        processed_query = self.text_cleaner.clean_stt_output(query_text) if clean_text else query_text
+        corpus = self._get_corpus()
+
+        row = corpus.row_of(last_verse_id) if last_verse_id is not None else None
+        if row is not None:
+            texts = corpus.texts(clean_text)
+            start = max(0, row - self.FOLLOW_LINES_BEHIND)
+            stop = min(len(corpus), row + self.FOLLOW_LINES_AHEAD + 1)
+            matches = process.extract(
+                processed_query,
+                {local_row: texts[local_row] for local_row in range(start, stop)},
+                scorer=self._get_ratio_function(ratio_type),
+                limit=limit,
+                score_cutoff=score_cutoff,
+            )
+            if matches and matches[0][1] >= confidence:
+                results = [
+                    FuzzySearchResult(verse_id=corpus.ids[local_row], score=score, ratio_type=ratio_type)
+                    for _, score, local_row in matches
+                ]
+                return self._hydrate(results), True
+
+        results = self.find_closest_matches(
+            processed_query, limit=limit, score_cutoff=score_cutoff, ratio_type=ratio_type, normalized=clean_text
+        )
+        return results, False
 
     def find_best_match(self, query_text: str, score_cutoff: float = 60.0, ratio_type: str = "WRatio") -> FuzzySearchResult | None:
         """
@@ -89,9 +449,14 @@ class SGGSFuzzySearcher:
         Returns:
             FuzzySearchResult object or None if no match above cutoff
         """
-        results = self.find_closest_matches(
-            query_text, limit=1, score_cutoff=score_cutoff, ratio_type=ratio_type
-        )
+        key = self._best_match_key(query_text, score_cutoff, ratio_type)
+        results = self._cached(key)
+        if results is None:
+            version = self._get_corpus().version
+            results = self.find_closest_matches(
+                query_text, limit=1, score_cutoff=score_cutoff, ratio_type=ratio_type
+            )
+            self._remember(key, version, results)
         return results[0] if results else None
 
     def compare_with_multiple_methods(
@@ -100,6 +465,9 @@ class SGGSFuzzySearcher:
         """
         Compare the query text using multiple fuzzy matching methods.
 
+        All methods share one corpus lookup and one candidate shortlist, and are
+        scored concurrently, so this costs about as much as a single search.
+
         Args:
             query_text: The text to search for
             limit: Maximum number of results per method
@@ -108,15 +476,8 @@ class SGGSFuzzySearcher:
         Returns:
             Dictionary with method names as keys and results as values
         """
-        methods = ["ratio", "partial_ratio", "token_sort_ratio", "WRatio"]
-        results = {}
-
-        for method in methods:
-            results[method] = self.find_closest_matches(
-                query_text, limit=limit, score_cutoff=score_cutoff, ratio_type=method
-            )
-
-        return results
+        jobs = {method: (query_text, False, method) for method in self.COMPARISON_METHODS}
+        return self._score_concurrently(jobs, limit=limit, score_cutoff=score_cutoff)
 
     def _get_ratio_function(self, ratio_type: str) -> Any:
         """Get the appropriate ratio function from rapidfuzz."""
@@ -136,26 +497,96 @@ class SGGSFuzzySearcher:
         limit: int = 10,
         score_cutoff: float = 60.0,
         clean_text: bool = True,
+        max_span: int = 1,
+        ratio_type: str = "WRatio",
     ) -> list[FuzzySearchResult]:
         """
         Search with optional text preprocessing.
 
+        Results are cached by cleaned query and search parameters, so a
+        transcript that is sent again is answered without rescoring.
+
         Args:
             query_text: The text to search for
             limit: Maximum number of results
             score_cutoff: Minimum similarity score
             clean_text: Whether to apply text cleaning
+            max_span: Allow matches spanning up to this many consecutive lines
+            ratio_type: Type of ratio calculation
 
         Returns:
             List of FuzzySearchResult objects
         """
-        processed_query = query_text
-        if clean_text:
-            processed_query = self.text_cleaner.clean_stt_output(query_text)
+        key = self._search_key(query_text, limit, score_cutoff, clean_text, max_span, ratio_type)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        version = self._get_corpus().version
+        results = self.search_processed(key[1], limit, score_cutoff, clean_text, max_span, ratio_type)
+        self._remember(key, version, results)
+        return results
 
-        return self.find_closest_matches(
-            processed_query, limit=limit, score_cutoff=score_cutoff
-        )
+    def search_processed(
+        self,
+        query_text: str,
+        limit: int = 10,
+        score_cutoff: float = 60.0,
+        clean_text: bool = True,
+        max_span: int = 1,
+        ratio_type: str = "WRatio",
+    ) -> list[FuzzySearchResult]:
+        """
+        Score a query search_with_preprocessing has already cleaned (if `clean_text`), without the result cache.
+
+        Lets a caller that cleaned the query to build the cache key hand the
+        scoring to a worker without the query being cleaned twice.
+        """
+        # A cleaned query is compared with the corpus cleaned the same way
+        if max_span > 1:
+            return self.find_spanning_matches(
+                query_text, max_span=max_span, limit=limit, score_cutoff=score_cutoff, ratio_type=ratio_type, normalized=clean_text
+            )
+        return self.find_closest_matches(query_text, limit=limit, score_cutoff=score_cutoff, ratio_type=ratio_type, normalized=clean_text)
+
+    def _search_key(
+        self,
+        query_text: str,
+        limit: int = 10,
+        score_cutoff: float = 60.0,
+        clean_text: bool = True,
+        max_span: int = 1,
+        ratio_type: str = "WRatio",
+    ) -> tuple:
+        """Result cache key for search_with_preprocessing; the query is cleaned first so equivalent transcripts share it."""
+        processed_query = self.text_cleaner.clean_stt_output(query_text) if clean_text else query_text
+        return ("search", processed_query, limit, score_cutoff, ratio_type, clean_text, max_span)
+
+    def _best_match_key(self, query_text: str, score_cutoff: float = 60.0, ratio_type: str = "WRatio") -> tuple:
+        """Result cache key for find_best_match, which scores the query as given."""
+        return ("best", query_text, score_cutoff, ratio_type)
+
+    def cache_key(self, method: str, kwargs: dict[str, Any]) -> tuple | None:
+        """Result cache key for calling `method(**kwargs)`, or None if that method is not cached."""
+        if method == "search_with_preprocessing":
+            return self._search_key(**kwargs)
+        if method == "find_best_match":
+            return self._best_match_key(**kwargs)
+        return None
+
+    def _cached(self, key: tuple) -> list[FuzzySearchResult] | None:
+        """Hydrated results stored under `key` for the current corpus, if any."""
+        if self.result_cache is None:
+            return None
+        entry = self.result_cache.get(key, self._get_corpus().version)
+        if entry is None:
+            return None
+        return self._hydrate([FuzzySearchResult(verse_id, score, ratio_type, span) for verse_id, score, ratio_type, span in entry])
+
+    def _remember(self, key: tuple, version: int, results: list[FuzzySearchResult]) -> None:
+        """Cache results scored against corpus `version`; only ids and scores are kept, never ORM rows."""
+        if self.result_cache is not None:
+            self.result_cache.put(key, version, tuple((result.verse_id, result.score, result.ratio_type, result.span) for result in results))
 
     def _preprocess_text(self, text: str) -> str:
         """
@@ -204,18 +635,13 @@ class SGGSFuzzySearcher:
         Returns:
             Dictionary with cleaning approach names as keys and results as values
         """
-        approaches = {
-            "no_cleaning": query_text,
-            "cleaning": self.text_cleaner.clean_stt_output(query_text),
+        jobs = {
+            "no_cleaning": (query_text, False, "WRatio"),
+            "cleaning": (self.text_cleaner.clean_stt_output(query_text), True, "WRatio"),
         }
+        scored = self._score_concurrently(jobs, limit=limit, score_cutoff=score_cutoff)
 
-        results = {}
-        for approach, cleaned_query in approaches.items():
-            results[approach] = {
-                "cleaned_query": cleaned_query,
-                "results": self.find_closest_matches(
-                    cleaned_query, limit=limit, score_cutoff=score_cutoff
-                )
-            }
-
-        return results
+        return {
+            approach: {"cleaned_query": cleaned_query, "results": scored[approach]}
+            for approach, (cleaned_query, _, _) in jobs.items()
+        }
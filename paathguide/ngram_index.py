@@ -0,0 +1,112 @@
+"""Character n-gram inverted index used to shortlist fuzzy search candidates."""
+
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+
+
+class NGramIndex:
+    """
+    Inverted index from character n-grams to the rows containing them.
+
+    Posting lists are stored CSR-style: one flat ``array('I')`` of row numbers,
+    with ``postings[indptr[g]:indptr[g + 1]]`` holding the rows for gram slot ``g``.
+
+    An index returned by `patched` keeps those posting lists as they were built.
+    Their entries, and one new entry per row inserted since, are then ids that
+    `rows` maps to the current row (-1 once dropped); `extra` holds the posting
+    lists of the inserted rows.
+    """
+
+    def __init__(
+        self,
+        grams: dict[str, int],
+        indptr: array,
+        postings: array,
+        n: int = 3,
+        rows: array | None = None,
+        extra: dict[str, array] | None = None,
+        edits: int = 0,
+        dropped: int = 0,
+    ):
+        self.grams = grams
+        self.indptr = indptr
+        self.postings = postings
+        self.n = n
+        self.rows = rows
+        self.extra = extra if extra is not None else {}
+        self.edits = edits  # rows inserted or dropped since the posting lists were built
+        self.dropped = dropped  # posting ids mapped to -1
+
+    @classmethod
+    def build(cls, texts: Iterable[str], n: int = 3) -> "NGramIndex":
+        """Index every text by its distinct character n-grams; row numbers follow iteration order."""
+        rows_by_gram: dict[str, array] = {}
+        for row, text in enumerate(texts):
+            for gram in cls._grams(text, n):
+                rows = rows_by_gram.get(gram)
+                if rows is None:
+                    rows = rows_by_gram[gram] = array("I")
+                rows.append(row)
+
+        grams: dict[str, int] = {}
+        indptr = array("I", [0])
+        postings = array("I")
+        for slot, (gram, rows) in enumerate(rows_by_gram.items()):
+            grams[gram] = slot
+            postings.extend(rows)
+            indptr.append(len(postings))
+        return cls(grams, indptr, postings, n)
+
+    @staticmethod
+    def _grams(text: str, n: int) -> set[str]:
+        """Distinct n-grams of a text, padded so word edges form grams of their own."""
+        padded = f" {' '.join(text.split())} "
+        return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+    def patched(self, edits: Iterable[tuple[int, str | None]], size: int) -> "NGramIndex":
+        """
+        Copy of the index with rows dropped or inserted, leaving the built posting lists alone.
+
+        `edits` apply in order, like list.pop and list.insert: (row, None) drops
+        `row` and (row, text) inserts `text` as `row`, shifting the rows after
+        it. `size` is the number of rows this index describes. Each edit costs
+        one pass over the row map and the inserted text's grams, instead of a
+        rebuild over every row.
+        """
+        rows = array("q", self.rows if self.rows is not None else range(size))
+        extra = {gram: array("I", ids) for gram, ids in self.extra.items()}
+        count, dropped = self.edits, self.dropped
+        for row, text in edits:
+            if text is None:
+                rows = array("q", (-1 if current == row else current - 1 if current > row else current for current in rows))
+                dropped += 1
+            else:
+                rows = array("q", (current + 1 if current >= row else current for current in rows))
+                for gram in self._grams(text, self.n):
+                    extra.setdefault(gram, array("I")).append(len(rows))
+                rows.append(row)
+            count += 1
+        return NGramIndex(self.grams, _owned(self.indptr), _owned(self.postings), self.n, rows, extra, count, dropped)
+
+    def candidates(self, query: str, limit: int = 300) -> list[int]:
+        """Rows sharing the most n-grams with `query`, best first."""
+        counts: Counter[int] = Counter()
+        indptr, postings, extra = self.indptr, self.postings, self.extra
+        for gram in self._grams(query, self.n):
+            slot = self.grams.get(gram)
+            if slot is not None:
+                counts.update(postings[indptr[slot] : indptr[slot + 1]])
+            if gram in extra:
+                counts.update(extra[gram])
+        if self.rows is None:
+            return [row for row, _ in counts.most_common(limit)]
+        # Dropped rows may still be counted; look far enough down to make up for them
+        rows = self.rows
+        found = (rows[posting] for posting, _ in counts.most_common(limit + self.dropped))
+        return [row for row in found if row >= 0][:limit]
+
+
+def _owned(column: array | memoryview) -> array:
+    """`column` as an array of its own, e.g. to stop sharing (and pickle) a snapshot's mapped posting lists."""
+    return column if isinstance(column, array) else array(column.format, column.tobytes())
@@ -0,0 +1,83 @@
+"""LRU + TTL cache of fuzzy search results, tied to the corpus version they were scored against."""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+import threading
+import time
+from typing import Any
+
+from paathguide.config import settings
+
+
+class QueryResultCache:
+    """
+    Bounded cache of search results keyed by cleaned query and search parameters.
+
+    Entries expire after `ttl_seconds` and the least recently used entry is
+    evicted once `max_entries` is reached. Every lookup carries the corpus
+    version; as soon as a newer version is seen the whole cache is dropped, so
+    a result is never served from a corpus that has since changed.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._version: int | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Any | None:
+        """Cached value for `key` scored against corpus `version`, or None."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key) if version == self._version else None
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """Remember `value`, unless it was scored against an older corpus than the cache has seen."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            if version != self._version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _check_version(self, version: int) -> None:
+        if self._version is None or version > self._version:
+            self._entries.clear()
+            self._version = version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "corpus_version": self._version,
+            }
+
+
+# Shared by every SGGSFuzzySearcher in this process
+query_result_cache = QueryResultCache(max_entries=settings.result_cache_size, ttl_seconds=settings.result_cache_ttl)
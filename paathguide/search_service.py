@@ -0,0 +1,255 @@
+"""Bounded process pool that runs fuzzy searches away from the API's event loop and thread pool."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import threading
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from paathguide.config import settings
+from paathguide.corpus import CorpusPatch, VerseStore, corpus_cache
+from paathguide.fuzzy_search import FuzzySearchResult, SGGSFuzzySearcher
+from paathguide.result_cache import QueryResultCache, query_result_cache
+from paathguide.snapshot import load_snapshot
+from paathguide.text_cleaner import WhisperTextCleaner
+
+# SGGSFuzzySearcher methods the service will run for callers
+SEARCH_METHODS = frozenset({"search_with_preprocessing", "search_processed", "follow", "find_closest_matches_many", "compare_with_multiple_methods", "find_best_match"})
+
+
+logger = logging.getLogger(__name__)
+
+
+class SearchQueueFull(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+class StoreSearcher(SGGSFuzzySearcher):
+    """
+    Searcher bound to one corpus snapshot, with no database session.
+
+    Results carry verse ids only; the caller hydrates them. This is what runs
+    inside the worker processes, where result caching is left to the API process.
+    """
+
+    def __init__(self, store: VerseStore, result_cache: QueryResultCache | None = None):
+        super().__init__(db=None)  # type: ignore[arg-type]
+        self.store = store
+        self.text_cleaner = WhisperTextCleaner(enable_logging=False)
+        self.result_cache = result_cache
+
+    def _get_corpus(self) -> VerseStore:
+        return self.store
+
+    def _hydrate(self, results: list[FuzzySearchResult]) -> list[FuzzySearchResult]:
+        return results
+
+
+# Per-process searcher, set up once by the pool initializer
+_worker_searcher: StoreSearcher | None = None
+
+
+def _init_worker(store: VerseStore | str, version: int) -> None:
+    global _worker_searcher
+    # A snapshot path: map the file the API process loaded rather than unpickling a private copy
+    store = load_snapshot(store) if isinstance(store, str) else store
+    store.version = version
+    _worker_searcher = StoreSearcher(store)
+
+
+def _ping() -> None:
+    """No-op task used to start every worker up front."""
+
+
+def _run_in_worker(method: str, kwargs: dict[str, Any], patches: list[tuple[int, CorpusPatch]]) -> Any:
+    searcher = _worker_searcher
+    # Catch up with the writes made since this worker loaded the corpus
+    for version, patch in patches:
+        if version > searcher.store.version:
+            searcher.store = searcher.store.patched(patch, version)
+    return getattr(searcher, method)(**kwargs)
+
+
+def _run_inline(store: VerseStore, method: str, kwargs: dict[str, Any]) -> Any:
+    return getattr(StoreSearcher(store), method)(**kwargs)
+
+
+def _hydrate(db: Session, method: str, value: Any) -> Any:
+    """Attach Verse rows to whatever shape `method` returns, with one lookup."""
+    searcher = SGGSFuzzySearcher(db)
+    if method == "follow":
+        results, matched_locally = value
+        return searcher._hydrate(results), matched_locally
+    if method == "find_best_match":
+        hydrated = searcher._hydrate([value]) if value is not None else []
+        return hydrated[0] if hydrated else None
+    if method == "compare_with_multiple_methods":
+        return dict(zip(value, searcher._hydrate_groups(list(value.values())), strict=True))
+    if method == "find_closest_matches_many":
+        return searcher._hydrate_groups(value)
+    return searcher._hydrate(value)
+
+
+class SearchService:
+    """
+    Runs CPU-bound fuzzy searches on a pool of worker processes.
+
+    Each worker holds its own copy of the prebuilt corpus and n-gram indexes
+    (or maps the same corpus snapshot as the API process), so searches scale with cores instead of contending for the GIL with the
+    CRUD endpoints. Writes to the shared corpus travel with each search as the
+    patches the workers have yet to replay. Only when the corpus is replaced
+    outright (or `REBASE_AFTER` patches pile up) is a new pool started, in the
+    background; the current pool keeps serving until every new worker is up.
+
+    Calls to the cached searcher methods are looked up in `result_cache`
+    first, in this process, so repeated queries never reach a worker.
+
+    At most `workers + queue_depth` searches are accepted at a time; beyond
+    that `run` raises `SearchQueueFull` rather than letting requests pile up.
+    With `workers=0` searches run on the event loop's default thread pool.
+    """
+
+    # Patches sent along with every search before the pool is rebuilt around the current corpus
+    REBASE_AFTER = 64
+
+    def __init__(self, workers: int, queue_depth: int, result_cache: QueryResultCache | None = query_result_cache):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.result_cache = result_cache
+        self.cleaner = WhisperTextCleaner(enable_logging=False)
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_store: VerseStore | None = None
+        self._warming: VerseStore | None = None
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        """Searches that may be running or waiting at once."""
+        return max(1, self.workers) + self.queue_depth
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self, db: Session) -> None:
+        """Load the corpus and start the workers, so the first search doesn't pay for it."""
+        self._prepare(db)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._pool_store = None
+
+    async def run(self, db: Session, method: str, **kwargs: Any) -> Any:
+        """
+        Run `SGGSFuzzySearcher.<method>(**kwargs)` off the event loop and hydrate the results.
+
+        Raises:
+            SearchQueueFull: If `capacity` searches are already in flight
+        """
+        if method not in SEARCH_METHODS:
+            raise ValueError(f"Unsupported search method: {method}")
+        if self._in_flight >= self.capacity:
+            raise SearchQueueFull(f"Search queue is full ({self.capacity} searches in flight)")
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            store, pool, patches = await loop.run_in_executor(None, self._prepare, db)
+
+            # Repeated queries are answered from the result cache without reaching a worker
+            searcher = StoreSearcher(store, self.result_cache)
+            key = await loop.run_in_executor(None, searcher.cache_key, method, kwargs)
+            cached = searcher._cached(key) if key is not None else None
+            if cached is not None:
+                value = (cached[0] if cached else None) if method == "find_best_match" else cached
+            else:
+                task, task_kwargs = method, kwargs
+                if method == "search_with_preprocessing":
+                    # The key already holds the cleaned query; don't clean it again in the worker
+                    task, task_kwargs = "search_processed", {**kwargs, "query_text": key[1]}
+                if pool is not None:
+                    value = await asyncio.wrap_future(pool.submit(_run_in_worker, task, task_kwargs, patches))
+                else:
+                    value = await loop.run_in_executor(None, _run_inline, store, task, task_kwargs)
+                if key is not None:
+                    searcher._remember(key, store.version, ([value] if value else []) if method == "find_best_match" else value)
+            return await loop.run_in_executor(None, _hydrate, db, method, value)
+        finally:
+            self._in_flight -= 1
+
+    def _prepare(self, db: Session) -> tuple[VerseStore, ProcessPoolExecutor | None, list[tuple[int, CorpusPatch]]]:
+        """Corpus to search with its indexes built, the pool to run on, and the patches its workers must replay first."""
+        store = corpus_cache.get(db, self.cleaner)
+        store.ngram_index(normalized=False)
+        store.ngram_index(normalized=True)
+        if self.workers == 0:
+            return store, None, []
+
+        with self._lock:
+            if self._pool is None:
+                # Nothing to serve from yet: start the first pool right here
+                self._pool, self._pool_store = self._start_pool(store), store
+                return store, self._pool, []
+
+            pool, pool_store = self._pool, self._pool_store
+            patches = [] if pool_store is store else corpus_cache.patches_since(pool_store.version)
+            if patches is not None and pool_store is not store:
+                patches = [entry for entry in patches if entry[0] <= store.version]
+                if not patches:
+                    patches = None  # same version, but not the store the cache patched
+            if patches is None or len(patches) > self.REBASE_AFTER:
+                self._rebase(store)
+            if patches is None:
+                # Served from the corpus the workers hold until the new pool is up
+                return pool_store, pool, []
+            return store, pool, patches
+
+    def _start_pool(self, store: VerseStore) -> ProcessPoolExecutor:
+        """A pool whose workers have all loaded `store`."""
+        # spawn, not fork: the API process is multi-threaded by the time this runs
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(store.snapshot_path or store, store.version),
+        )
+        for future in [pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def _rebase(self, store: VerseStore) -> None:
+        """Start a pool holding `store` on a background thread, unless one is already starting (called under `_lock`)."""
+        if self._warming is None:
+            self._warming = store
+            threading.Thread(target=self._swap_in, args=(store,), name="search-pool-warm", daemon=True).start()
+
+    def _swap_in(self, store: VerseStore) -> None:
+        try:
+            pool = self._start_pool(store)
+        except Exception:
+            logger.exception("Could not start a new search pool; the current one keeps serving")
+            with self._lock:
+                self._warming = None
+            return
+
+        with self._lock:
+            self._warming = None
+            stale = self._pool
+            if stale is None:
+                # Shut down while the new pool was starting
+                pool.shutdown(wait=False, cancel_futures=True)
+                return
+            self._pool, self._pool_store = pool, store
+        # Searches already submitted finish on the old workers
+        stale.shutdown(wait=False)
+
+
+# Shared by the API's fuzzy search endpoints
+search_service = SearchService(workers=settings.search_workers, queue_depth=settings.search_queue_depth)
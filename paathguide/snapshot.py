@@ -0,0 +1,191 @@
+"""Versioned, memory-mapped snapshot of the fuzzy search corpus and its n-gram indexes."""
+
+from array import array
+import json
+import mmap
+import os
+from pathlib import Path
+import struct
+import sys
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from paathguide.corpus import TextColumn, VerseStore
+from paathguide.db import models
+from paathguide.ngram_index import NGramIndex
+from paathguide.text_cleaner import WhisperTextCleaner
+
+MAGIC = b"PGSNAP\x00\x00"
+# Bump whenever the layout below changes; older files are refused rather than misread
+FORMAT_VERSION = 1
+# Sections start on this boundary, so every integer column can be read in place
+_ALIGNMENT = 8
+_GRAM_SEPARATOR = "\n"  # never part of a gram: the index collapses whitespace to single spaces
+
+
+class SnapshotError(Exception):
+    """A snapshot file that isn't one, or was written by an incompatible version."""
+
+
+def corpus_stamp(db: Session) -> list | None:
+    """
+    Identify the state of the database's corpus.
+
+    Every write through VerseRepository moves `corpus_stats.updated_at`, so a
+    snapshot whose stamp still matches holds the same verses as the database.
+    Returns None for databases without a stats row, which are never matched.
+    """
+    stats = models.CorpusStats
+    row = db.execute(select(stats.total_verses, stats.updated_at).where(stats.id == 1)).first()
+    if row is None or row.updated_at is None:
+        return None
+    return [row.total_verses, row.updated_at.isoformat()]
+
+
+def build_snapshot(db: Session, path: str | os.PathLike) -> int:
+    """
+    Build the corpus, its normalized column and both n-gram indexes from the database and write them to `path`.
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    # The stamp and rows are read in one transaction, so they describe the same corpus
+    stamp = corpus_stamp(db)
+    verse = models.Verse
+    store = VerseStore.from_rows(db.execute(select(verse.id, verse.gurmukhi_text, verse.page_number, verse.line_number)).all())
+    cleaner = WhisperTextCleaner()
+    cleaner.stats = None  # corpus lines aren't query traffic
+    store = store.normalized_by(cleaner.clean_stt_output, cleaner.fingerprint())
+    return write_snapshot(store, path, stamp)
+
+
+def write_snapshot(store: VerseStore, path: str | os.PathLike, stamp: list | None = None) -> int:
+    """
+    Write `store` and both of its n-gram indexes (built if need be) to `path`.
+
+    The file is written next to `path` and renamed over it, so processes that
+    already mapped the old snapshot keep reading a complete file.
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    sections: dict[str, array | bytes] = {
+        "ids": store.ids,
+        "page_numbers": store.page_numbers,
+        "line_numbers": store.line_numbers,
+        **_text_sections("text", store.text),
+    }
+    if store.normalized is not None:
+        sections.update(_text_sections("normalized", store.normalized))
+    for name, normalized in (("raw", False), ("normalized", True)):
+        if normalized and store.normalized is None:
+            continue
+        index = store.ngram_index(normalized)
+        if index.rows is not None:
+            # Patched since it was built; only a plain CSR index can be written out
+            index = NGramIndex.build(store.texts(normalized))
+        sections[f"ngram.{name}.grams"] = _GRAM_SEPARATOR.join(index.grams).encode("utf-8")
+        sections[f"ngram.{name}.indptr"] = index.indptr
+        sections[f"ngram.{name}.postings"] = index.postings
+
+    layout = {}
+    position = 0
+    for name, data in sections.items():
+        size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+        layout[name] = [position, size, data.typecode if isinstance(data, array) else "utf-8"]
+        position = _aligned(position + size)
+    header = json.dumps(
+        {
+            "format": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "stamp": stamp,
+            "rows": len(store),
+            "normalizer": store.normalizer,
+            "ngram_n": store.ngram_index(False).n,
+            "sections": layout,
+        }
+    ).encode("utf-8")
+
+    path = Path(path)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as file:
+        file.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        file.write(b"\0" * (_aligned(file.tell()) - file.tell()))
+        start = file.tell()
+        for name, data in sections.items():
+            file.write(b"\0" * (start + layout[name][0] - file.tell()))
+            file.write(data.tobytes() if isinstance(data, array) else data)
+    os.replace(partial, path)
+    return path.stat().st_size
+
+
+def load_snapshot(path: str | os.PathLike, stamp: list | None = None) -> VerseStore:
+    """
+    Map a snapshot into memory as a ready-to-search VerseStore.
+
+    Integer columns and posting lists are read in place from the mapping, so
+    every process that loads the same file shares those pages through the OS
+    page cache; only the text columns and gram table are decoded per process.
+
+    Args:
+        path: File written by `write_snapshot`
+        stamp: If given, the `corpus_stamp` the snapshot must have been built at
+
+    Raises:
+        SnapshotError: If the file isn't a snapshot this version can read, or its stamp differs
+    """
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise SnapshotError(f"{path} is not a corpus snapshot")
+    (header_size,) = struct.unpack_from("<Q", view, len(MAGIC))
+    header_start = len(MAGIC) + 8
+    header = json.loads(bytes(view[header_start : header_start + header_size]))
+    if header["format"] != FORMAT_VERSION or header["byteorder"] != sys.byteorder:
+        raise SnapshotError(f"{path} has format {header['format']} ({header['byteorder']}-endian); expected {FORMAT_VERSION} ({sys.byteorder}-endian)")
+    if stamp is not None and header["stamp"] != stamp:
+        raise SnapshotError(f"{path} was built from a different version of the corpus")
+
+    start = _aligned(header_start + header_size)
+
+    def section(name: str) -> memoryview | str:
+        offset, size, typecode = header["sections"][name]
+        data = view[start + offset : start + offset + size]
+        return str(data, "utf-8") if typecode == "utf-8" else data.cast(typecode)
+
+    def text_column(name: str) -> TextColumn:
+        return TextColumn(section(f"{name}.buffer"), section(f"{name}.offsets"))
+
+    store = VerseStore(
+        ids=section("ids"),
+        page_numbers=section("page_numbers"),
+        line_numbers=section("line_numbers"),
+        text=text_column("text"),
+        version=0,
+    )
+    if "normalized.buffer" in header["sections"]:
+        store.normalized = text_column("normalized")
+        store.normalizer = header["normalizer"]
+    for name, normalized in (("raw", False), ("normalized", True)):
+        if f"ngram.{name}.grams" in header["sections"]:
+            grams = section(f"ngram.{name}.grams")
+            store._ngram_indexes[normalized] = NGramIndex(
+                {gram: slot for slot, gram in enumerate(grams.split(_GRAM_SEPARATOR))} if grams else {},
+                section(f"ngram.{name}.indptr"),
+                section(f"ngram.{name}.postings"),
+                header["ngram_n"],
+            )
+    store.snapshot_path = os.fspath(path)
+    return store
+
+
+def _text_sections(name: str, column: TextColumn) -> dict[str, array | bytes]:
+    # Offsets count characters, so the buffer decodes back to the same string they index
+    return {f"{name}.offsets": column.offsets, f"{name}.buffer": column.buffer.encode("utf-8")}
+
+
+def _aligned(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
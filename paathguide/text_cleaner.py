@@ -1,20 +1,56 @@
 """Text cleaning and preprocessing utilities for SGGS text."""
 
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+import copy
+import hashlib
+from itertools import islice
 import logging
+import os
 import re
+import threading
+import time
+from typing import Any
 import unicodedata
 
+from paathguide.config import settings
+
+# Patterns used by the fixed cleaning steps, compiled once at import
+REPEATED_CHARACTER_RE = re.compile(r"(.)\1{2,}")
+PUNCTUATION_WORD_RE = re.compile(r"^[^\w\s]{3,}$")
+
+HALANT = "੍"
+# Single characters kept by the aggressive cleaning step
+IMPORTANT_SINGLE_CHARACTERS = frozenset({"ਸ", "ਤ", "ਨ"})
+# Very common function words that don't help matching
+STOP_WORDS = frozenset({"ਹੈ", "ਹੋ", "ਨੈ", "ਤੇ", "ਦੇ", "ਨੂੰ"})  # Add more as needed
+# Common conjuncts that get split by STT
+CONJUNCT_MAPPINGS = (
+    ("ਸ ਤ", "ਸਤ"),
+    ("ਗ ੁਰ", "ਗੁਰ"),
+    ("ਪ ਰ", "ਪਰ"),
+)
+
 
 class WhisperTextCleaner:
     """Text cleaning and preprocessing for SGGS Gurmukhi text."""
 
-    def __init__(self, enable_logging: bool = True):
+    # Bump whenever the built-in cleaning steps change, so corpora normalized
+    # with an older cleaner get rebuilt (see `fingerprint`)
+    PIPELINE_VERSION = 1
+
+    def __init__(self, enable_logging: bool = False, stats: "CleaningStats | None" = None):
         """Initialize the text cleaner with predefined mappings and patterns.
-        
+
         Args:
-            enable_logging: Whether to enable detailed step-by-step logging
+            enable_logging: Log every cleaning step (at DEBUG level). When off, or when
+                the logger isn't enabled for DEBUG, no step messages are built at all.
+            stats: Record per-step timings and mapping hits here. Defaults to the shared
+                `cleaning_stats` when PAATHGUIDE_CLEANER_STATS is set, otherwise nothing is recorded.
         """
         self.enable_logging = enable_logging
+        self.stats = stats if stats is not None else (cleaning_stats if settings.cleaner_stats else None)
         self.logger = logging.getLogger(__name__)
 
         if enable_logging and not self.logger.handlers:
@@ -23,7 +59,7 @@ class WhisperTextCleaner:
             formatter = logging.Formatter("%(levelname)s - %(message)s")
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+            self.logger.setLevel(logging.DEBUG)
 
         # Common STT error mappings for Gurmukhi
         self.character_mappings = {
@@ -52,18 +88,35 @@ class WhisperTextCleaner:
             (r"(ਸ਼ਿ\s*){2,}", "ਸ਼ਿ"),
             (r"(ਚੁਂ\s*){2,}", "ਚੁਂ"),
         ]
+        # repeated_patterns compiled on first use, keyed by pattern string
+        self._compiled_patterns: dict[str, re.Pattern] = {}
+
+    def fingerprint(self) -> str:
+        """
+        Identify this cleaner's configuration.
+
+        Two cleaners with the same fingerprint produce the same output for any
+        input, so text cleaned by one can be compared with text cleaned by the other.
+        """
+        config = (
+            self.PIPELINE_VERSION,
+            list(self.character_mappings.items()),
+            list(self.word_mappings.items()),
+            list(self.repeated_patterns),
+        )
+        return hashlib.sha1(repr(config).encode("utf-8")).hexdigest()
 
     def _log_transformation(self, step: str, text: str) -> None:
         """Log text transformation step."""
         if self.enable_logging and text:
-            self.logger.info(f"Step: {step:<33} Text: '{text}'")
+            self.logger.debug(f"Step: {step:<33} Text: '{text}'")
 
     def clean_stt_output(self, text: str) -> str:
         """
         Clean speech-to-text output with comprehensive preprocessing steps.
         This is the main cleaning method that includes all available cleaning techniques:
         - Unicode normalization
-        - Whitespace normalization 
+        - Whitespace normalization
         - Repeated character fixing
         - Character and word mappings
         - Pattern normalization
@@ -71,93 +124,77 @@ class WhisperTextCleaner:
         - Selective diacritic removal
         - Conjunct normalization
         - Content word extraction
-        
+
         Args:
             text: Raw STT output text
-            
+
         Returns:
             Fully cleaned and optimized text
         """
         if not text:
             return ""
 
-        if self.enable_logging:
-            self.logger.info("=" * 60)
-            self.logger.info("STARTING TEXT CLEANING PROCESS")
-            self.logger.info("=" * 60)
-
+        log = self.enable_logging and self.logger.isEnabledFor(logging.DEBUG)
+        if not log and self.stats is None:
+            # Nothing to log or record: run the steps back to back
+            for _, step in self.STEPS:
+                text = step(self, text)
+            return text.strip()
+
+        if log:
+            self.logger.debug("=" * 60)
+            self.logger.debug("STARTING TEXT CLEANING PROCESS")
+            self.logger.debug("=" * 60)
+            self._log_transformation("0. Original", text)
+
+        # Time every step and count which rules fired; mapping steps are run rule by rule
+        clock = time.perf_counter_ns
+        stages: list[tuple[str, int, int]] = []
+        hits: dict[tuple[str, str], int] = {}
         current_text = text
-        self._log_transformation("0. Original", current_text)
-
-        # Step 1: Basic normalization
-        current_text = self._normalize_unicode(current_text)
-        self._log_transformation("1. Unicode Normalization", current_text)
-
-        # Step 2: Remove extra whitespace
-        current_text = self._normalize_whitespace(current_text)
-        self._log_transformation("2. Whitespace Normalization", current_text)
-
-        # Step 3: Fix repeated characters
-        current_text = self._fix_repeated_characters(current_text)
-        self._log_transformation("3. Fix Repeated Characters", current_text)
-
-        # Step 4: Apply character mappings
-        current_text = self._apply_character_mappings(current_text)
-        self._log_transformation("4. Character Mappings", current_text)
-
-        # Step 5: Apply word mappings
-        current_text = self._apply_word_mappings(current_text)
-        self._log_transformation("5. Word Mappings", current_text)
-
-        # Step 6: Handle repeated patterns
-        current_text = self._normalize_repeated_patterns(current_text)
-        self._log_transformation("6. Normalize Repeated Patterns", current_text)
-
-        # Step 7: Aggressive cleaning (always applied)
-        current_text = self._aggressive_clean(current_text)
-        self._log_transformation("7. Aggressive Cleaning", current_text)
-
-        # Step 8: Additional cleaning methods for better matching
-        current_text = self._remove_diacritics_selectively(current_text)
-        self._log_transformation("8. Remove Diacritics Selectively", current_text)
-
-        current_text = self._normalize_conjuncts(current_text)
-        self._log_transformation("9. Normalize Conjuncts", current_text)
-
-        current_text = self._extract_content_words(current_text)
-        self._log_transformation("10. Extract Content Words", current_text)
-
+        for name, step in self.STEPS:
+            kind = self._COUNTED_STEPS.get(step)
+            start = clock()
+            cleaned = step(self, current_text) if kind is None else self._apply_counting(kind, current_text, hits)
+            stages.append((name, clock() - start, len(current_text) - len(cleaned)))
+            current_text = cleaned
+            if log:
+                self._log_transformation(name, current_text)
+
+        start = clock()
         final_result = current_text.strip()
-        self._log_transformation("11. Final Strip", final_result)
+        stages.append(("11. Final Strip", clock() - start, len(current_text) - len(final_result)))
+        if log:
+            self._log_transformation("11. Final Strip", final_result)
 
-        if self.enable_logging:
-            self.logger.info("=" * 60)
-            self.logger.info("CLEANING PROCESS COMPLETED")
-            self.logger.info("=" * 60)
+        if self.stats is not None:
+            self.stats.record(len(text), len(final_result), stages, hits)
+        if log:
+            self.logger.debug("=" * 60)
+            self.logger.debug("CLEANING PROCESS COMPLETED")
+            self.logger.debug("=" * 60)
 
         return final_result
 
     def _normalize_unicode(self, text: str) -> str:
         """Normalize Unicode characters."""
-        # Normalize to NFD then back to NFC to handle different encodings
-        text = unicodedata.normalize("NFD", text)
-        text = unicodedata.normalize("NFC", text)
-        return text
+        # NFC decomposes before composing, so this equals NFD followed by NFC
+        return unicodedata.normalize("NFC", text)
 
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize whitespace characters."""
-        # Replace multiple whitespace with single space
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        # Replace multiple whitespace with single space; split() uses the same
+        # whitespace definition as the regex \s and drops the ends like strip()
+        return " ".join(text.split())
 
     def _fix_repeated_characters(self, text: str) -> str:
         """Fix repeated characters like ਪੱੱਾਦ -> ਪਾਦ."""
         # Remove excessive repetition of same character (3+ times)
-        text = re.sub(r"(.)\1{2,}", r"\1", text)
-        return text
+        return REPEATED_CHARACTER_RE.sub(r"\1", text)
 
     def _apply_character_mappings(self, text: str) -> str:
         """Apply predefined character mappings."""
+        # In order: a later mapping sees the output of the earlier ones
         for wrong, correct in self.character_mappings.items():
             text = text.replace(wrong, correct)
         return text
@@ -171,39 +208,38 @@ class WhisperTextCleaner:
     def _normalize_repeated_patterns(self, text: str) -> str:
         """Normalize repeated patterns using regex."""
         for pattern, replacement in self.repeated_patterns:
-            text = re.sub(pattern, replacement, text)
+            text = self._compiled(pattern).sub(replacement, text)
         return text
 
+    def _compiled(self, pattern: str) -> re.Pattern:
+        regex = self._compiled_patterns.get(pattern)
+        if regex is None:
+            regex = self._compiled_patterns[pattern] = re.compile(pattern)
+        return regex
+
     def _aggressive_clean(self, text: str) -> str:
         """Apply more aggressive cleaning."""
-        # Remove very short words (likely artifacts)
-        words = text.split()
-        words = [word for word in words if len(word) > 1 or word in ["ਸ", "ਤ", "ਨ"]]  # Keep important single chars
-
-        # Remove words with excessive punctuation
-        words = [word for word in words if not re.match(r"^[^\w\s]{3,}$", word)]
-
-        return " ".join(words)
+        # Remove very short words (likely artifacts), keeping important single chars,
+        # and words made of 3+ punctuation marks (a word starting with a letter or
+        # digit, i.e. a \w character, can't be one, so the regex is skipped for those)
+        punctuation_only = PUNCTUATION_WORD_RE.match
+        return " ".join([
+            word
+            for word in text.split()
+            if (len(word) > 1 or word in IMPORTANT_SINGLE_CHARACTERS)
+            and (len(word) < 3 or word[0].isalnum() or not punctuation_only(word))
+        ])
 
     def _remove_diacritics_selectively(self, text: str) -> str:
         """Selectively remove some diacritics that cause matching issues."""
         # This is tricky for Gurmukhi - be very careful
         # Only remove certain marks that are commonly misrecognized
-        text = re.sub(r"੍", "", text)  # Remove halant in some cases
-        return text
+        return text.replace(HALANT, "")  # Remove halant in some cases
 
     def _normalize_conjuncts(self, text: str) -> str:
         """Normalize conjunct consonants that might be split."""
-        # Handle common conjuncts that get split by STT
-        conjunct_mappings = {
-            "ਸ ਤ": "ਸਤ",
-            "ਗ ੁਰ": "ਗੁਰ",
-            "ਪ ਰ": "ਪਰ",
-        }
-
-        for split, joined in conjunct_mappings.items():
+        for split, joined in CONJUNCT_MAPPINGS:
             text = text.replace(split, joined)
-
         return text
 
     def _extract_content_words(self, text: str) -> str:
@@ -211,8 +247,7 @@ class WhisperTextCleaner:
         words = text.split()
 
         # Remove very common function words that don't help matching
-        stop_words = {"ਹੈ", "ਹੋ", "ਨੈ", "ਤੇ", "ਦੇ", "ਨੂੰ"}  # Add more as needed
-        content_words = [word for word in words if word not in stop_words]
+        content_words = [word for word in words if word not in STOP_WORDS]
 
         # If we removed too much, keep original
         if len(content_words) < len(words) * 0.3:  # Keep at least 30% of words
@@ -220,6 +255,90 @@ class WhisperTextCleaner:
 
         return " ".join(content_words)
 
+    # The cleaning steps in order, named as in the step log (the final strip follows them)
+    STEPS = (
+        ("1. Unicode Normalization", _normalize_unicode),
+        ("2. Whitespace Normalization", _normalize_whitespace),
+        ("3. Fix Repeated Characters", _fix_repeated_characters),
+        ("4. Character Mappings", _apply_character_mappings),
+        ("5. Word Mappings", _apply_word_mappings),
+        ("6. Normalize Repeated Patterns", _normalize_repeated_patterns),
+        ("7. Aggressive Cleaning", _aggressive_clean),
+        ("8. Remove Diacritics Selectively", _remove_diacritics_selectively),
+        ("9. Normalize Conjuncts", _normalize_conjuncts),
+        ("10. Extract Content Words", _extract_content_words),
+    )
+    # Steps made of individual rules, whose hits are counted when stats are collected
+    _COUNTED_STEPS = {
+        _apply_character_mappings: "character",
+        _apply_word_mappings: "word",
+        _normalize_repeated_patterns: "pattern",
+        _normalize_conjuncts: "conjunct",
+    }
+
+    def _rules(self, kind: str) -> Iterable[tuple[str, str]]:
+        """The (pattern, replacement) rules applied, in order, by the step counted as `kind`."""
+        if kind == "character":
+            return self.character_mappings.items()
+        if kind == "word":
+            return self.word_mappings.items()
+        if kind == "pattern":
+            return self.repeated_patterns
+        return CONJUNCT_MAPPINGS
+
+    def _apply_counting(self, kind: str, text: str, hits: dict[tuple[str, str], int]) -> str:
+        """Run a rule-based step, adding how many times each rule matched to `hits`."""
+        for pattern, replacement in self._rules(kind):
+            if kind == "pattern":
+                text, count = self._compiled(pattern).subn(replacement, text)
+            else:
+                # count() and replace() both take non-overlapping matches from the left
+                count = text.count(pattern)
+                if count:
+                    text = text.replace(pattern, replacement)
+            if count:
+                hits[kind, pattern] = hits.get((kind, pattern), 0) + count
+        return text
+
+    def clean_many(self, texts: Iterable[str], workers: int | None = 1, chunk_size: int = 512) -> Iterator[str]:
+        """
+        Clean many texts, yielding the results in input order.
+
+        `texts` is consumed lazily. With more than one worker, chunks of
+        `chunk_size` texts are cleaned on a process pool; at most two chunks per
+        worker are in flight at a time, so memory stays bounded however long the
+        input is. Step logging is never emitted from the workers.
+
+        Args:
+            texts: Raw STT outputs (any iterable, e.g. a file being read)
+            workers: Worker processes; 1 cleans in this process, None uses every core
+            chunk_size: Texts sent to a worker at a time
+
+        Yields:
+            The cleaned text for each input, in order
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            for text in texts:
+                yield self.clean_stt_output(text)
+            return
+
+        quiet = copy.copy(self)
+        quiet.enable_logging = False
+        quiet.stats = None
+        iterator = iter(texts)
+        pending: deque[Future] = deque()
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            while chunk := list(islice(iterator, chunk_size)):
+                pending.append(pool.submit(_clean_chunk, quiet, chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
     def compare_cleaning_methods(self, text: str) -> dict[str, str]:
         """
         Compare different cleaning methods for analysis.
@@ -262,6 +381,189 @@ class WhisperTextCleaner:
             "reduction_percent": round((len(original) - len(cleaned)) / len(original) * 100, 2) if original else 0
         }
 
+    def get_stage_stats(self) -> dict[str, Any]:
+        """
+        Get cumulative statistics for every text this cleaner's `stats` recorded.
+
+        Returns:
+            `CleaningStats.snapshot()`, plus `unused_mappings`: this cleaner's rules
+            that never matched, by kind. Only `{"enabled": False}` if nothing is recorded.
+        """
+        if self.stats is None:
+            return {"enabled": False}
+        snapshot = self.stats.snapshot()
+        hits = snapshot["mapping_hits"]
+        snapshot["unused_mappings"] = {
+            kind: [pattern for pattern, _ in self._rules(kind) if pattern not in hits[kind]]
+            for kind in self._COUNTED_STEPS.values()
+        }
+        return {"enabled": True, **snapshot}
+
+
+class CleaningStats:
+    """
+    Cumulative instrumentation of the cleaning pipeline, shared between cleaners.
+
+    For each step it keeps the total time spent and the net number of
+    characters removed, and for every mapping, repeated pattern and conjunct
+    rule how often it matched. Each cleaned text is merged in under a lock, so
+    one instance can be shared by cleaners on different threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.texts = 0
+            self.chars_in = 0
+            self.chars_out = 0
+            self._stages: dict[str, list[int]] = {}  # step name -> [nanoseconds, chars removed]
+            self._hits: dict[tuple[str, str], int] = {}
+
+    def record(self, chars_in: int, chars_out: int, stages: list[tuple[str, int, int]], hits: dict[tuple[str, str], int]) -> None:
+        """Add one cleaned text: its (step, nanoseconds, chars removed) per step and rule hits."""
+        with self._lock:
+            self.texts += 1
+            self.chars_in += chars_in
+            self.chars_out += chars_out
+            for name, elapsed, removed in stages:
+                totals = self._stages.setdefault(name, [0, 0])
+                totals[0] += elapsed
+                totals[1] += removed
+            for rule, count in hits.items():
+                self._hits[rule] = self._hits.get(rule, 0) + count
+
+    def snapshot(self) -> dict[str, Any]:
+        """Totals so far, with steps in pipeline order and rule hits grouped by kind."""
+        with self._lock:
+            texts = self.texts
+            stages = [
+                {
+                    "stage": name,
+                    "total_ms": round(elapsed / 1e6, 3),
+                    "mean_us": round(elapsed / texts / 1e3, 3) if texts else 0.0,
+                    "chars_removed": removed,
+                }
+                for name, (elapsed, removed) in self._stages.items()
+            ]
+            mapping_hits: dict[str, dict[str, int]] = {kind: {} for kind in WhisperTextCleaner._COUNTED_STEPS.values()}
+            for (kind, pattern), count in sorted(self._hits.items(), key=lambda item: -item[1]):
+                mapping_hits[kind][pattern] = count
+            return {
+                "texts": texts,
+                "chars_in": self.chars_in,
+                "chars_out": self.chars_out,
+                "stages": stages,
+                "mapping_hits": mapping_hits,
+            }
+
+
+# Shared by every cleaner created while PAATHGUIDE_CLEANER_STATS is on
+cleaning_stats = CleaningStats()
+
+
+class IncrementalTextCleaner:
+    """
+    Cleans a transcript that keeps growing, e.g. during continuous listening.
+
+    `append` returns exactly what `clean_stt_output` would return for the whole
+    transcript so far, but only re-cleans a short tail of raw words. Words
+    further back are finalized: their steps 1-9 output is cached, and the
+    global step 10 decision (drop stop words unless fewer than 30% of the words
+    would be left) is made from running word counts.
+
+    A cut between finalized and tail words is only made at least `margin_words`
+    words behind the end, so no literal mapping can reach across it, and only
+    after checking that cleaning the two sides separately gives the same text as
+    cleaning them together (which rules out repeated-pattern runs and cascading
+    mappings crossing it). The cleaning work per update is therefore
+    O(new text + margin). Finalized text is kept as a list of chunks and only
+    joined when a result is asked for (once per batch of finalized words), so
+    building the returned string is the one part that grows with the transcript.
+    """
+
+    def __init__(self, cleaner: WhisperTextCleaner | None = None, margin_words: int = 8):
+        self.cleaner = cleaner or WhisperTextCleaner()
+        self.margin_words = margin_words
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new transcript."""
+        self._tail = ""  # raw text not finalized yet
+        self._prefix_chunks: list[str] = []  # steps 1-9 output of the finalized words
+        self._prefix_words = 0
+        self._prefix_content_chunks: list[str] = []  # finalized words without stop words
+        self._prefix_content_words = 0
+        self._joined: tuple[str, str] | None = None  # both chunk lists joined, until more are finalized
+
+    def append(self, text: str) -> str:
+        """Add newly transcribed text and return the cleaned transcript so far."""
+        self._tail += text
+        words = self._tail.split()
+        margin = self._margin()
+        if len(words) > 2 * margin:
+            self._finalize(words, margin)
+        return self.result()
+
+    def result(self) -> str:
+        """Cleaned transcript so far; equal to `clean_stt_output` of everything appended."""
+        tail = self._clean_until_content_words(self._tail)
+        if self._joined is None:
+            self._joined = " ".join(self._prefix_chunks), " ".join(self._prefix_content_chunks)
+        prefix, prefix_content = self._joined
+
+        tail_words = tail.split()
+        tail_content = [word for word in tail_words if word not in STOP_WORDS]
+        if self._prefix_content_words + len(tail_content) < (self._prefix_words + len(tail_words)) * 0.3:
+            return (f"{prefix} {tail}" if prefix else tail).strip()
+        return " ".join([prefix_content, *tail_content] if prefix_content else tail_content)
+
+    def _margin(self) -> int:
+        """Tail words kept back: at least every literal mapping's span, in words, summed over the steps."""
+        spans = (
+            max((wrong.count(" ") + 1 for wrong in mappings), default=0)
+            for mappings in (self.cleaner.character_mappings, self.cleaner.word_mappings, dict(CONJUNCT_MAPPINGS))
+        )
+        return max(self.margin_words, sum(spans) + 2)
+
+    def _clean_until_content_words(self, text: str) -> str:
+        """Steps 1-9 of the cleaning pipeline."""
+        cleaner = self.cleaner
+        for _, step in cleaner.STEPS:
+            if step is not WhisperTextCleaner._extract_content_words:
+                text = step(cleaner, text)
+        return text
+
+    def _finalize(self, words: list[str], margin: int) -> None:
+        """Move the oldest tail words into the finalized prefix at the first cut that cleans the same."""
+        clean = self._clean_until_content_words
+        whole = clean(" ".join(words))
+        for cut in range(len(words) - margin, max(0, len(words) - 2 * margin), -1):
+            head, rest = clean(" ".join(words[:cut])), clean(" ".join(words[cut:]))
+            if head.strip() and rest.strip() and whole == f"{head} {rest}":
+                break
+        else:
+            return  # e.g. a repeated pattern runs across every candidate cut; keep the longer tail
+
+        head_words = head.split()
+        content = [word for word in head_words if word not in STOP_WORDS]
+        self._prefix_chunks.append(head)
+        self._prefix_words += len(head_words)
+        if content:
+            self._prefix_content_chunks.append(" ".join(content))
+            self._prefix_content_words += len(content)
+        self._joined = None
+
+        trailing_space = " " if self._tail[-1:].isspace() else ""
+        self._tail = " ".join(words[cut:]) + trailing_space
+
+
+def _clean_chunk(cleaner: WhisperTextCleaner, texts: list[str]) -> list[str]:
+    """Worker task for `WhisperTextCleaner.clean_many`."""
+    return [cleaner.clean_stt_output(text) for text in texts]
+
 
 def main():
     """Test the WhisperTextCleaner with sample STT output."""
@@ -6,10 +6,17 @@ import sys
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from paathguide import api
 from paathguide.data_loader import load_sample_data
-from paathguide.db import schemas
-from paathguide.db.models import SessionLocal, create_tables
+from paathguide.db import models, schemas
+from paathguide.db.models import SessionLocal, create_tables, get_async_db, get_read_only_db, make_async_engine
 from paathguide.db.repository import VerseRepository
+from paathguide.search_service import SearchService
+from test_corpus import SAMPLE_LINES, make_session
 
 
 def test_basic_functionality():
@@ -64,5 +71,56 @@ def test_basic_functionality():
     return True
 
 
+def test_fuzzy_search_honours_clean_text(monkeypatch):
+    """clean_text=false scores the raw query against the raw corpus."""
+    db = make_session()
+    monkeypatch.setattr(api, "search_service", SearchService(workers=0, queue_depth=4))
+    api.app.dependency_overrides[get_read_only_db] = lambda: db
+    try:
+        client = TestClient(api.app)
+        params = {"query_text": "ਸ਼ਿ ਸ਼ਿ ਸ਼ਿ ਆਦਿ ਸਚੁ", "score_cutoff": 80}
+
+        found = {}
+        for clean_text in (True, False):
+            response = client.get("/fuzzy-search/", params={**params, "clean_text": clean_text})
+            assert response.status_code == 200
+            assert response.json()["search_params"]["clean_text"] is clean_text
+            found[clean_text] = sorted(result["verse"]["id"] for result in response.json()["results"])
+        assert found == {True: [1, 2], False: [2]}
+    finally:
+        api.app.dependency_overrides.clear()
+        db.close()
+
+
+def test_verse_list_keeps_the_bare_list_until_paged(tmp_path):
+    """Old clients still get a list paged by skip; paged=true returns pages with a stored total."""
+    url = f"sqlite:///{tmp_path / 'sggs.db'}"
+    sync_engine = models.make_engine(url)
+    models.Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        VerseRepository(db).bulk_create_verses([schemas.VerseCreate(gurmukhi_text=text, page_number=page, line_number=line) for text, page, line in SAMPLE_LINES])
+    async_sessions = async_sessionmaker(make_async_engine(url), expire_on_commit=False)
+
+    async def get_test_db():
+        async with async_sessions() as db:
+            yield db
+
+    api.app.dependency_overrides[get_async_db] = get_test_db
+    try:
+        client = TestClient(api.app)
+        legacy = client.get("/verses/", params={"skip": 2, "limit": 2})
+        assert legacy.status_code == 200 and legacy.headers["Deprecation"] == "true"
+        assert [verse["id"] for verse in legacy.json()] == [3, 4]
+
+        page = client.get("/verses/", params={"paged": True, "limit": 4}).json()
+        assert (page["total"], page["total_is_estimate"]) == (len(SAMPLE_LINES), False)
+        rest = client.get("/verses/", params={"cursor": page["next_cursor"], "limit": 4})
+        assert "Deprecation" not in rest.headers
+        assert [verse["id"] for verse in page["verses"] + rest.json()["verses"]] == list(range(1, len(SAMPLE_LINES) + 1))
+    finally:
+        api.app.dependency_overrides.clear()
+        sync_engine.dispose()
+
+
 if __name__ == "__main__":
     test_basic_functionality()
@@ -0,0 +1,193 @@
+"""Tests for the in-memory fuzzy search corpus and its n-gram index."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from paathguide.corpus import CorpusPatch, VerseStore, corpus_cache
+from paathguide.db import models, schemas
+from paathguide.db.repository import VerseRepository
+from paathguide.fuzzy_search import SGGSFuzzySearcher
+from paathguide.ngram_index import NGramIndex
+from paathguide.search_service import StoreSearcher
+from paathguide.snapshot import SnapshotError, build_snapshot, corpus_stamp, load_snapshot
+from paathguide.text_cleaner import WhisperTextCleaner
+
+SAMPLE_LINES = [
+    ("ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ ॥", 1, 4),
+    ("ਹੈ ਭੀ ਸਚੁ ਨਾਨਕ ਹੋਸੀ ਭੀ ਸਚੁ ॥੧॥", 1, 5),
+    ("ਸੋਚੈ ਸੋਚਿ ਨ ਹੋਵਈ ਜੇ ਸੋਚੀ ਲਖ ਵਾਰ ॥", 1, 6),
+    ("ਤੁਮਹੇ ਛਾਡਿ ਕੋਈ ਅਵਰ ਨ ਧਿਆਊਂ", 404, 5),
+    ("ਰਹਾਉ ॥", 404, 6),
+    ("ਰਹਾਉ ॥", 405, 2),
+]
+
+
+def make_session():
+    """Fresh in-memory database with the sample lines loaded."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    VerseRepository(db).bulk_create_verses([schemas.VerseCreate(gurmukhi_text=text, page_number=page, line_number=line) for text, page, line in SAMPLE_LINES])
+    corpus_cache.invalidate()
+    return db
+
+
+def test_verse_store_keeps_reading_order_and_duplicates():
+    store = VerseStore.from_rows([(3, "c", 2, 1), (1, "a", 1, 2), (2, "a", 1, 1), (4, "x", None, None)])
+
+    assert list(store.ids) == [2, 1, 3, 4]
+    assert list(store.text) == ["a", "a", "c", "x"]
+    assert list(store.rows())[-1] == (4, "x", None, None)
+
+
+def test_verse_store_patches_are_copy_on_write():
+    store = VerseStore.from_rows([(1, "a", 1, 1), (2, "b", 1, 2)])
+    patched = store.patched(CorpusPatch(rows=((2, "B", 1, 2), (3, "c", 1, 3))), version=2)
+    trimmed = patched.patched(CorpusPatch(removed=(1,)), version=3)
+
+    assert list(store.text) == ["a", "b"]
+    assert list(patched.text) == ["a", "B", "c"]
+    assert list(trimmed.ids) == [2, 3]
+
+
+def test_verse_store_patches_rows_and_indexes_in_place():
+    rows = [(1, "ਆਦਿ ਸਚੁ", 1, 1), (2, "ਜੁਗਾਦਿ ਸਚੁ", 1, 2), (3, "ਹੈ ਭੀ ਸਚੁ", 2, 1), (4, "ਰਹਾਉ", None, None)]
+    store = VerseStore.from_rows([(*row, row[1] + " ਜੀ") for row in rows], version=1, normalizer="test")
+    store.ngram_index(False)
+    store.ngram_index(True)
+
+    # Unchanged text and position (e.g. a translation edit): same columns and indexes, new version
+    same = store.patched(CorpusPatch(rows=((2, "ਜੁਗਾਦਿ ਸਚੁ", 1, 2, "ਜੁਗਾਦਿ ਸਚੁ ਜੀ"),)), version=2)
+    assert same.version == 2 and same.text is store.text and same.ngram_index(True) is store.ngram_index(True)
+
+    # A moved line and a new one land at their place in reading order, without rebuilding either index
+    moved = (1, "ਆਦਿ ਸਚੁ", 2, 2, "ਆਦਿ ਸਚੁ ਜੀ")
+    added = (5, "ਨਾਨਕ ਹੋਸੀ", 1, 3, "ਨਾਨਕ ਹੋਸੀ ਜੀ")
+    patched = same.patched(CorpusPatch(rows=(moved, added)), version=3).patched(CorpusPatch(removed=(3,)), version=4)
+    expected = VerseStore.from_rows([(2, "ਜੁਗਾਦਿ ਸਚੁ", 1, 2, "ਜੁਗਾਦਿ ਸਚੁ ਜੀ"), added, moved, (4, "ਰਹਾਉ", None, None, "ਰਹਾਉ ਜੀ")], normalizer="test")
+    assert list(patched.rows()) == list(expected.rows())
+    assert list(patched.normalized) == list(expected.normalized)
+    assert patched.row_of(5) == 1 and patched.ngram_edits() == 4
+    for normalized in (False, True):
+        for query in ("ਆਦਿ ਸਚੁ", "ਨਾਨਕ", "ਹੈ ਭੀ ਸਚੁ ਜੀ"):
+            found = patched.ngram_index(normalized).candidates(query, limit=2)
+            assert sorted(found) == sorted(expected.ngram_index(normalized).candidates(query, limit=2))
+
+
+def test_ngram_index_ranks_rows_by_shared_grams():
+    texts = ["ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ", "ਸੋਚੈ ਸੋਚਿ ਨ ਹੋਵਈ", "ਤੁਮਹੇ ਛਾਡਿ ਕੋਈ ਅਵਰ"]
+    index = NGramIndex.build(texts)
+
+    assert index.candidates("ਜੁਗਾਦ ਸਚ", limit=1) == [0]
+    assert index.candidates("zzz") == []
+
+
+def test_fuzzy_search_returns_duplicate_lines():
+    db = make_session()
+    results = SGGSFuzzySearcher(db).find_closest_matches("ਰਹਾਉ ॥", limit=5, score_cutoff=99)
+
+    assert sorted(result.verse.page_number for result in results) == [404, 405]
+    db.close()
+
+
+def test_spanning_search_matches_consecutive_lines_across_pages():
+    db = make_session()
+    searcher = SGGSFuzzySearcher(db)
+    query = "ਸੋਚੈ ਸੋਚਿ ਨ ਹੋਵਈ ਜੇ ਸੋਚੀ ਲਖ ਵਾਰ ॥ ਤੁਮਹੇ ਛਾਡਿ ਕੋਈ ਅਵਰ ਨ ਧਿਆਊਂ"
+
+    best = searcher.find_spanning_matches(query, max_span=3, limit=1, score_cutoff=90)[0]
+
+    assert (best.verse.page_number, best.verse.line_number, best.span) == (1, 6, 2)
+    db.close()
+
+
+def test_batch_search_matches_single_queries():
+    db = make_session()
+    searcher = SGGSFuzzySearcher(db)
+    searcher.text_cleaner = WhisperTextCleaner(enable_logging=False)
+    queries = ["ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ", "ਤੁਮੇ ਛਾਡ ਕੋਈ ਅਵਰ"]
+
+    batch = searcher.find_closest_matches_many(queries, limit=2, score_cutoff=50)
+    single = [searcher.search_with_preprocessing(query, limit=2, score_cutoff=50) for query in queries]
+
+    for batch_results, single_results in zip(batch, single, strict=True):
+        assert [(r.verse_id, r.score) for r in batch_results] == [(r.verse_id, r.score) for r in single_results]
+    db.close()
+
+
+def test_follow_mode_prefers_lines_after_last_match():
+    db = make_session()
+    searcher = SGGSFuzzySearcher(db)
+    searcher.text_cleaner = WhisperTextCleaner(enable_logging=False)
+    last = searcher.find_closest_matches("ਤੁਮਹੇ ਛਾਡਿ ਕੋਈ ਅਵਰ ਨ ਧਿਆਊਂ", limit=1)[0]
+
+    # Only the first "ਰਹਾਉ ॥" after page 404 line 5 is in the local window
+    results, matched_locally = searcher.follow("ਰਹਾਉ ॥", last.verse_id, limit=5)
+    assert matched_locally
+    assert [result.verse.page_number for result in results][:1] == [404]
+
+    results, matched_locally = searcher.follow("ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ", None, limit=1)
+    assert not matched_locally and results[0].verse.page_number == 1
+    db.close()
+
+
+def test_corpus_cache_follows_repository_writes():
+    db = make_session()
+    repo = VerseRepository(db)
+    searcher = SGGSFuzzySearcher(db)
+    searcher.text_cleaner = WhisperTextCleaner(enable_logging=False)
+
+    # Force the indexed path on this tiny corpus
+    searcher.CANDIDATE_LIMIT = 1
+    assert searcher.search_with_preprocessing("ਤੁਮੇ ਛਾਡ ਕੋਈ ਅਵਰ", limit=1)[0].verse.page_number == 404
+
+    verse = repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਗੁਰ ਪ੍ਰਸਾਦਿ ॥", page_number=1, line_number=3))
+    store = corpus_cache.get(db, searcher.text_cleaner)
+    assert verse.id in store.ids
+    assert store.normalized is not None and len(store.normalized) == len(store)
+
+    # Replayable by holders of the store the write was applied to
+    assert [patch.rows[0][0] for _, patch in corpus_cache.patches_since(store.version - 1)] == [verse.id]
+
+    repo.delete_verse(verse.id)
+    assert verse.id not in corpus_cache.get(db).ids
+    assert [patch.removed for _, patch in corpus_cache.patches_since(store.version)] == [(verse.id,)]
+    db.close()
+
+
+def test_snapshot_maps_the_same_corpus_until_the_database_changes(tmp_path):
+    db = make_session()
+    path = tmp_path / "sggs.snapshot"
+    build_snapshot(db, path)
+
+    mapped = load_snapshot(path, corpus_stamp(db))
+    built = corpus_cache.get(db, WhisperTextCleaner())
+    assert isinstance(mapped.ids, memoryview) and mapped.snapshot_path == str(path)
+    assert list(mapped.rows()) == list(built.rows())
+    assert (list(mapped.normalized), mapped.normalizer) == (list(built.normalized), built.normalizer)
+    found = []
+    for store in (mapped, built):
+        searcher = StoreSearcher(store)
+        searcher.CANDIDATE_LIMIT = 1  # score through the n-gram index
+        found.append([(result.verse_id, result.score) for result in searcher.search_with_preprocessing("ਤੁਮੇ ਛਾਡ ਕੋਈ ਅਵਰ", limit=2)])
+    assert found[0] == found[1] and found[0][0][0] == 4
+
+    VerseRepository(db).create_verse(schemas.VerseCreate(gurmukhi_text="ਗੁਰ ਪ੍ਰਸਾਦਿ ॥", page_number=1, line_number=3))
+    with pytest.raises(SnapshotError):
+        load_snapshot(path, corpus_stamp(db))
+    db.close()
+
+
+if __name__ == "__main__":
+    test_verse_store_keeps_reading_order_and_duplicates()
+    test_verse_store_patches_are_copy_on_write()
+    test_verse_store_patches_rows_and_indexes_in_place()
+    test_ngram_index_ranks_rows_by_shared_grams()
+    test_fuzzy_search_returns_duplicate_lines()
+    test_spanning_search_matches_consecutive_lines_across_pages()
+    test_batch_search_matches_single_queries()
+    test_follow_mode_prefers_lines_after_last_match()
+    test_corpus_cache_follows_repository_writes()
+    print("✅ Corpus tests passed")
@@ -0,0 +1,83 @@
+"""Tests for loading the DOCX into the database."""
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from paathguide.data_loader import SGGSDataLoader, iter_paragraphs
+from paathguide.db import models
+from paathguide.db.repository import VerseRepository
+
+# Alphabetized like the real document, with both of its page-line separators
+DOCUMENT_LINES = [
+    "Shri Guru Granth Sahib",
+    "Alphabetized",
+    "ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ ॥ (1­4)",
+    "ਤੁਮਹੇ ਛਾਡਿ ਕੋਈ ਅਵਰ ਨ ਧਿਆਊਂ (404-5)",
+    "ਸੋਚੈ ਸੋਚਿ ਨ ਹੋਵਈ ਜੇ ਸੋਚੀ ਲਖ ਵਾਰ ॥ (1­6)",
+    "",
+    "ਹੈ ਭੀ ਸਚੁ ਨਾਨਕ ਹੋਸੀ ਭੀ ਸਚੁ ॥੧॥ (1­5)",
+    "ੴ ਸਤਿ ਨਾਮੁ",
+]
+
+
+def write_document(path) -> str:
+    doc = Document()
+    for line in DOCUMENT_LINES:
+        doc.add_paragraph(line)
+    doc.save(path)
+    return str(path)
+
+
+def empty_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def rows(db) -> list[tuple]:
+    verse = models.Verse
+    return db.execute(select(verse.gurmukhi_text, verse.page_number, verse.line_number).order_by(verse.seq.nulls_last())).all()
+
+
+def test_load_by_page_joins_lines_in_order_and_can_keep_the_lines(tmp_path):
+    path = write_document(tmp_path / "sggs.docx")
+
+    db = empty_session()
+    progress = []
+    assert SGGSDataLoader(db).load_by_page(path, progress=progress.append) == 2
+    assert rows(db) == [
+        ("ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ ॥ ਹੈ ਭੀ ਸਚੁ ਨਾਨਕ ਹੋਸੀ ਭੀ ਸਚੁ ॥੧॥ ਸੋਚੈ ਸੋਚਿ ਨ ਹੋਵਈ ਜੇ ਸੋਚੀ ਲਖ ਵਾਰ ॥", 1, 0),
+        ("ਤੁਮਹੇ ਛਾਡਿ ਕੋਈ ਅਵਰ ਨ ਧਿਆਊਂ", 404, 0),
+    ]
+    assert progress == [2]
+    db.close()
+
+    db = empty_session()
+    assert SGGSDataLoader(db).load_by_page(path, include_lines=True) == 7
+    loaded = rows(db)
+    # Each page row comes first in reading order, ahead of its lines; the unnumbered line isn't placed
+    assert [(page, line) for _, page, line in loaded[:6]] == [(1, 0), (1, 4), (1, 5), (1, 6), (404, 0), (404, 5)]
+    assert loaded[6] == ("ੴ ਸਤਿ ਨਾਮੁ", None, None)
+    assert VerseRepository(db).get_stats().total_verses == 7
+    db.close()
+
+
+def test_streamed_paragraphs_match_python_docx(tmp_path):
+    doc = Document()
+    doc.add_paragraph("ਆਦਿ ਸਚੁ ॥ (1­4)")
+    run = doc.add_paragraph("ਜਪੁ").add_run(" ॥")
+    run.add_tab()
+    run.add_break()
+    run.add_text("ਹੈ ਭੀ ਸਚੁ")
+    run.add_break(WD_BREAK.PAGE)
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "inside a table"
+    doc.add_paragraph()
+    doc.add_paragraph("ਸੋਚੈ ਸੋਚਿ (1-6)")
+    path = tmp_path / "formatted.docx"
+    doc.save(path)
+
+    assert list(iter_paragraphs(str(path))) == [paragraph.text for paragraph in Document(str(path)).paragraphs]
+    assert "inside a table" not in iter_paragraphs(str(path))
@@ -0,0 +1,233 @@
+"""Tests for VerseRepository queries."""
+
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from paathguide.corpus import corpus_cache
+from paathguide.db import models, schemas
+from paathguide.db.pagination import InvalidCursor
+from paathguide.db.repository import AsyncVerseRepository, VerseRepository
+from test_corpus import SAMPLE_LINES, make_session
+
+
+def search(repo: VerseRepository, text: str, **filters) -> tuple[list[int], int]:
+    verses, total = repo.search_verses(schemas.VerseSearchQuery(query=text, **filters))
+    return [verse.id for verse in verses], total
+
+
+def test_search_uses_full_text_index_and_stays_in_sync():
+    db = make_session()
+    repo = VerseRepository(db)
+    assert models.search_index_exists(db.connection())
+
+    # Substring matches, best ranked first
+    assert search(repo, "ਸਚੁ") == ([1, 2], 2)
+    assert search(repo, "ਰਹਾਉ", page_number=405) == ([6], 1)
+    assert search(repo, 'ਚਿ "ਨ') == ([], 0)  # quotes are matched literally, not parsed
+
+    verse = repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਸਚੁ ਨਾਮੁ", page_number=2, line_number=1))
+    assert verse.id in search(repo, "ਨਾਮੁ")[0]
+    repo.update_verse(verse.id, schemas.VerseUpdate(gurmukhi_text="ਸਤਿ ਨਾਮੁ"))
+    assert search(repo, "ਸਚੁ ਨਾਮੁ") == ([], 0)
+    repo.delete_verse(verse.id)
+    assert search(repo, "ਨਾਮੁ") == ([], 0)
+    db.close()
+
+
+def test_short_queries_fall_back_to_like_and_snippets_mark_matches():
+    db = make_session()
+    repo = VerseRepository(db)
+
+    assert search(repo, "ਭੀ") == ([2], 1)  # shorter than a trigram
+    assert search(repo, "_") == ([], 0)  # LIKE wildcards are escaped
+
+    verses, _ = repo.search_verses(schemas.VerseSearchQuery(query="ਸੋਚ"))
+    assert repo.search_snippets("ਸੋਚ", verses) == ["[ਸੋਚ]ੈ [ਸੋਚ]ਿ ਨ ਹੋਵਈ ਜੇ [ਸੋਚ]ੀ ਲਖ ਵਾਰ ॥"]
+    verses, _ = repo.search_verses(schemas.VerseSearchQuery(query="ਭੀ"))
+    assert repo.search_snippets("ਭੀ", verses) == ["ਹੈ [ਭੀ] ਸਚੁ ਨਾਨਕ ਹੋਸੀ [ਭੀ] ਸਚੁ ॥੧॥"]
+    db.close()
+
+
+def test_cursor_pages_walk_reading_order_including_unnumbered_lines():
+    db = make_session()
+    repo = VerseRepository(db)
+    repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਬਿਨਾ ਅੰਕ"))  # no page or line: sorts first
+    repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਸਚੁ ਨਾਮੁ", page_number=1, line_number=1))
+
+    walked, cursor = [], None
+    while True:
+        page = repo.list_verses(cursor=cursor, limit=3, include_total=True)
+        walked += [verse.id for verse in page.verses]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert walked == [7, 8, 1, 2, 3, 4, 5, 6]
+    assert (page.total, page.total_is_estimate) == (8, False)
+
+    with pytest.raises(InvalidCursor):
+        repo.list_verses(cursor="not-a-cursor")
+    db.close()
+
+
+def test_search_totals_are_reused_until_the_corpus_changes():
+    db = make_session()
+    repo = VerseRepository(db)
+    query = schemas.VerseSearchQuery(query="ਰਹਾਉ", order="reading", limit=1)
+
+    first = repo.search_verses_page(query)
+    second = repo.search_verses_page(query.model_copy(update={"cursor": first.next_cursor}))
+    assert [verse.id for verse in first.verses + second.verses] == [5, 6]
+    assert (first.total, first.total_is_estimate, second.total_is_estimate) == (2, False, True)
+    assert second.next_cursor is None
+
+    repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਰਹਾਉ ਦੂਜਾ ॥", page_number=406, line_number=1))
+    assert repo.search_verses_page(query).total == 3
+    db.close()
+
+
+def test_stats_are_patched_on_every_write():
+    db = make_session()
+    repo = VerseRepository(db)
+
+    assert repo.get_stats() == schemas.StatsResponse(total_verses=6, total_pages=3, verses_with_translations=0, verses_with_transliterations=0, unique_raags=0, unique_authors=0)
+    verse = repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਸਚੁ ਨਾਮੁ", page_number=2, raag="ਆਸਾ", translation="True Name"))
+    repo.bulk_create_verses([schemas.VerseCreate(gurmukhi_text="ਨਾਮੁ", page_number=2, raag="ਆਸਾ", author="ਮਹਲਾ ੧")])
+    repo.update_verse(verse.id, schemas.VerseUpdate(raag="ਸੋਰਠਿ", translation=None))  # ਆਸਾ is still used
+    repo.delete_verse(6)  # the only line on page 405
+
+    patched = repo.get_stats()
+    assert (patched.total_verses, patched.total_pages, patched.unique_raags, patched.unique_authors) == (7, 3, 2, 1)
+    repo.refresh_stats()  # full recount
+    assert repo.get_stats() == patched
+    db.close()
+
+
+def test_random_verse_is_seedable_and_survives_stale_ids():
+    db = make_session()
+    repo = VerseRepository(db)
+
+    assert {repo.get_random_verse().id for _ in range(200)} == {1, 2, 3, 4, 5, 6}
+    assert len({repo.get_random_verse(seed="2024-01-01").id for _ in range(5)}) == 1
+
+    # Deleted behind the sampler's back (as another process would): falls back to a rowid probe
+    db.execute(models.Verse.__table__.delete().where(models.Verse.id != 4))
+    assert {repo.get_random_verse().id for _ in range(20)} == {4}
+
+    verse, page = repo.get_hukamnama(date(2024, 1, 1))
+    assert (verse.id, [line.id for line in page]) == (4, [4])
+    db.close()
+
+
+def test_reading_order_crosses_pages_and_writes_only_the_changed_verse():
+    db = make_session()
+    repo = VerseRepository(db)
+    gap = models.SEQ_GAP
+
+    # Verse 3 ends page 1; its neighbours continue on page 404
+    assert [verse.id for verse in repo.get_surrounding_verses(3, context=2)] == [1, 2, 3, 4, 5]
+    assert (repo.get_adjacent_verse(3, 1).id, repo.get_adjacent_verse(4, -1).id) == (4, 3)
+    assert (repo.get_adjacent_verse(1, 3).id, repo.get_adjacent_verse(6, 1)) == (4, None)
+
+    # Inserted between its neighbours' numbers; a delete leaves a gap behind
+    inserted = repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਸਚੁ ਨਾਮੁ", page_number=2, line_number=1))
+    repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਬਿਨਾ ਅੰਕ"))  # no page or line: not in the sequence
+    repo.delete_verse(2)
+
+    db.expire_all()
+    ordered = db.query(models.Verse).filter(models.Verse.seq.isnot(None)).order_by(models.Verse.seq).all()
+    assert [(verse.id, verse.seq) for verse in ordered] == [(1, gap), (3, 3 * gap), (7, 3 * gap + gap // 2), (4, 4 * gap), (5, 5 * gap), (6, 6 * gap)]
+    assert repo.get_adjacent_verse(inserted.id, -1).id == 3
+    assert [verse.id for verse in repo.get_surrounding_verses(inserted.id, context=2)] == [1, 3, 7, 4, 5]
+    assert repo.get_surrounding_verses(8) == []
+
+    # Once there is no number left between two neighbours, the reading order is renumbered
+    for _ in range(12):
+        repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਨਾਮੁ", page_number=2, line_number=1))
+    db.expire_all()
+    ordered = db.query(models.Verse).filter(models.Verse.seq.isnot(None)).order_by(models.Verse.seq).all()
+    assert [verse.id for verse in ordered] == [1, 3, 7, *range(9, 21), 4, 5, 6]
+
+    repo.bulk_create_verses([schemas.VerseCreate(gurmukhi_text="ਨਾਮੁ", page_number=1, line_number=1)])
+    db.expire_all()
+    ordered = db.query(models.Verse).filter(models.Verse.seq.isnot(None)).order_by(models.Verse.seq).all()
+    assert [verse.seq for verse in ordered] == [gap * n for n in range(1, len(ordered) + 1)]
+    assert ordered[0].id == 21
+    db.close()
+
+
+def test_bulk_insert_lines_indexes_numbers_and_counts_once():
+    db = make_session()
+    repo = VerseRepository(db)
+    lines = ["ਸਚੁ ਨਾਮੁ ਮੇਰਾ ॥ (406\u00ad1)", "ਨਾਮੁ ਜਪਿ ॥ (2-1)", "ਸਿਰਲੇਖ"]
+    assert [models.split_verse_line(line) for line in lines] == [("ਸਚੁ ਨਾਮੁ ਮੇਰਾ ॥", 406, 1), ("ਨਾਮੁ ਜਪਿ ॥", 2, 1), ("ਸਿਰਲੇਖ", None, None)]
+
+    reported = []
+    assert repo.bulk_insert_lines(map(models.split_verse_line, lines), batch_size=2, progress=reported.append) == 3
+    assert reported == [2, 3]
+    assert sorted(search(repo, "ਨਾਮੁ")[0]) == [7, 8]
+    assert [verse.id for verse in repo.get_surrounding_verses(8, context=1)] == [3, 8, 4]
+    assert repo.get_stats().total_verses == 9
+
+    # The insert trigger is back for ordinary writes
+    verse = repo.create_verse(schemas.VerseCreate(gurmukhi_text="ਨਾਮੁ ਧਿਆਇ", page_number=3, line_number=1))
+    assert verse.id in search(repo, "ਨਾਮੁ")[0]
+
+    # Into an empty table the reading order is assigned as the rows go in
+    db.query(models.Verse).delete()
+    repo.bulk_insert_lines([(text, page, line) for text, page, line in reversed(SAMPLE_LINES)] + [("ਸਿਰਲੇਖ", None, None)])
+    assigned = db.execute(models.Verse.__table__.select().with_only_columns(models.Verse.id, models.Verse.seq)).all()
+    repo.renumber_reading_order()
+    assert db.execute(models.Verse.__table__.select().with_only_columns(models.Verse.id, models.Verse.seq)).all() == assigned
+    assert sorted(seq for _, seq in assigned if seq) == [models.SEQ_GAP * n for n in range(1, 7)]
+    db.close()
+
+
+def test_async_repository_reads_match_the_sync_repository(tmp_path):
+    url = f"sqlite:///{tmp_path / 'sggs.db'}"
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repo = VerseRepository(db)
+    repo.bulk_create_verses([schemas.VerseCreate(gurmukhi_text=text, page_number=page, line_number=line) for text, page, line in SAMPLE_LINES])
+    corpus_cache.invalidate()
+
+    async def read(page_number: int):
+        async with AsyncSession(async_engine) as session:
+            async_repo = AsyncVerseRepository(session)
+            return (
+                [verse.id for verse in await async_repo.get_page_content(page_number)],
+                (await async_repo.list_verses(limit=2)).next_cursor,
+                await async_repo.get_stats(),
+            )
+
+    async def read_concurrently():
+        try:
+            return await asyncio.gather(*(read(page) for page in (1, 404, 405)))
+        finally:
+            await async_engine.dispose()
+
+    async_engine = models.make_async_engine(url)
+    results = asyncio.run(read_concurrently())
+    for page_number, (ids, cursor, stats) in zip((1, 404, 405), results, strict=True):
+        assert ids == [verse.id for verse in repo.get_page_content(page_number)]
+        assert cursor == repo.list_verses(limit=2).next_cursor
+        assert stats == repo.get_stats()
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    test_search_uses_full_text_index_and_stays_in_sync()
+    test_short_queries_fall_back_to_like_and_snippets_mark_matches()
+    test_cursor_pages_walk_reading_order_including_unnumbered_lines()
+    test_search_totals_are_reused_until_the_corpus_changes()
+    test_stats_are_patched_on_every_write()
+    test_random_verse_is_seedable_and_survives_stale_ids()
+    test_reading_order_crosses_pages_and_writes_only_the_changed_verse()
+    test_bulk_insert_lines_indexes_numbers_and_counts_once()
+    print("✅ Repository tests passed")
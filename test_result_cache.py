@@ -0,0 +1,49 @@
+"""Tests for the fuzzy search result cache."""
+
+import time
+
+from paathguide.fuzzy_search import SGGSFuzzySearcher
+from paathguide.result_cache import QueryResultCache
+from paathguide.text_cleaner import WhisperTextCleaner
+from test_corpus import make_session
+
+
+def test_cache_evicts_expires_and_follows_corpus_version():
+    cache = QueryResultCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1, "A")
+    cache.put("b", 1, "B")
+    assert cache.get("a", 1) == "A"
+    cache.put("c", 1, "C")  # evicts "b", the least recently used
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 0) is None  # scored against another corpus
+    assert cache.get("a", 2) is None  # newer corpus drops everything
+    cache.put("stale", 1, "S")
+    assert cache.get("stale", 2) is None
+
+    cache.ttl_seconds = 0.01
+    cache.put("d", 2, "D")
+    time.sleep(0.02)
+    assert cache.get("d", 2) is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_repeated_search_is_served_from_cache():
+    db = make_session()
+    searcher = SGGSFuzzySearcher(db)
+    searcher.text_cleaner = WhisperTextCleaner(enable_logging=False)
+    searcher.result_cache = QueryResultCache()
+
+    first = searcher.search_with_preprocessing("ਤੁਮੇ ਛਾਡ ਕੋਈ ਅਵਰ", limit=2, score_cutoff=50)
+    # Extra whitespace cleans to the same query, so it shares the cache entry
+    second = searcher.search_with_preprocessing("ਤੁਮੇ  ਛਾਡ ਕੋਈ ਅਵਰ ", limit=2, score_cutoff=50)
+
+    assert [(r.verse.id, r.score) for r in second] == [(r.verse.id, r.score) for r in first]
+    assert (searcher.result_cache.hits, searcher.result_cache.misses) == (1, 1)
+    db.close()
+
+
+if __name__ == "__main__":
+    test_cache_evicts_expires_and_follows_corpus_version()
+    test_repeated_search_is_served_from_cache()
+    print("✅ Result cache tests passed")
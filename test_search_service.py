@@ -0,0 +1,91 @@
+"""Tests for the process-pool fuzzy search service."""
+
+import asyncio
+
+import pytest
+
+from paathguide.db import schemas
+from paathguide.db.repository import VerseRepository
+from paathguide.result_cache import QueryResultCache
+from paathguide.search_service import SearchQueueFull, SearchService
+from paathguide.text_cleaner import WhisperTextCleaner
+from test_corpus import make_session
+
+
+def search_ids(service: SearchService, db, query: str) -> list[tuple[int, float]]:
+    results = asyncio.run(service.run(db, "search_with_preprocessing", query_text=query, limit=3, score_cutoff=50))
+    return [(result.verse.id, result.score) for result in results]
+
+
+def test_pool_and_inline_searches_agree():
+    db = make_session()
+    inline = SearchService(workers=0, queue_depth=0)
+    pool = SearchService(workers=1, queue_depth=0)
+    try:
+        query = "ਤੁਮੇ ਛਾਡ ਕੋਈ ਅਵਰ"
+        assert search_ids(pool, db, query) == search_ids(inline, db, query) != []
+
+        results, matched_locally = asyncio.run(pool.run(db, "follow", query_text="ਰਹਾਉ ॥", last_verse_id=4, limit=1))
+        assert matched_locally and results[0].verse.page_number == 404
+    finally:
+        pool.shutdown()
+        db.close()
+
+
+def test_workers_replay_writes_without_a_new_pool():
+    db = make_session()
+    service = SearchService(workers=1, queue_depth=0)
+    try:
+        assert search_ids(service, db, "ਗੁਰ ਪ੍ਰਸਾਦਿ ॥") == []
+        pool = service._pool
+
+        verse = VerseRepository(db).create_verse(schemas.VerseCreate(gurmukhi_text="ਗੁਰ ਪ੍ਰਸਾਦਿ ॥", page_number=1, line_number=3))
+        assert search_ids(service, db, "ਗੁਰ ਪ੍ਰਸਾਦਿ ॥")[0] == (verse.id, 100.0)
+
+        VerseRepository(db).delete_verse(verse.id)
+        assert search_ids(service, db, "ਗੁਰ ਪ੍ਰਸਾਦਿ ॥") == []
+        assert service._pool is pool and service._warming is None
+    finally:
+        service.shutdown()
+        db.close()
+
+
+def test_a_cache_miss_cleans_the_query_once(monkeypatch):
+    db = make_session()
+    service = SearchService(workers=0, queue_depth=0, result_cache=QueryResultCache(max_entries=8, ttl_seconds=60))
+    service.start(db)
+    query = "ਤੁਮੇ ਛਾਡ ਕੋਈ ਅਵਰ"
+    cleaned = []
+    clean_stt_output = WhisperTextCleaner.clean_stt_output
+
+    def counting_clean(self, text):
+        if text == query:
+            cleaned.append(text)
+        return clean_stt_output(self, text)
+
+    monkeypatch.setattr(WhisperTextCleaner, "clean_stt_output", counting_clean)
+    first = search_ids(service, db, query)
+    assert len(cleaned) == 1
+
+    # A hit cleans it only to look up the key
+    assert search_ids(service, db, query) == first != []
+    assert len(cleaned) == 2
+    db.close()
+
+
+def test_full_queue_rejects_new_searches():
+    db = make_session()
+    service = SearchService(workers=0, queue_depth=0)
+    service._in_flight = service.capacity
+
+    with pytest.raises(SearchQueueFull):
+        search_ids(service, db, "ਰਹਾਉ")
+    db.close()
+
+
+if __name__ == "__main__":
+    test_pool_and_inline_searches_agree()
+    test_workers_replay_writes_without_a_new_pool()
+    test_a_cache_miss_cleans_the_query_once(pytest.MonkeyPatch())
+    test_full_queue_rejects_new_searches()
+    print("✅ Search service tests passed")
@@ -0,0 +1,112 @@
+"""Tests for WhisperTextCleaner."""
+
+import json
+import logging
+import random
+
+from click.testing import CliRunner
+
+from paathguide.cli import cli
+from paathguide.text_cleaner import CleaningStats, IncrementalTextCleaner, WhisperTextCleaner
+
+# Outputs of the original step-by-step cleaner; the compiled pipeline must match them exactly
+EXPECTED = [
+    (
+        "ਗੁਰ ਪੱੱਾਦ ਜਾਪ ਆਦ ਸਾਚ ਜਗਾਦ ਸਾਚ ਹਿ ਸਾਚ ਨਾਨਕ ਹੋ ਸੀਬੀ ਸਾਚ ਸਚ਼ਿ ਸ਼ਿ ਸ਼ਿ ਸ਼ਿ ਸ਼ਿ",
+        "ਗੁਰ ਪੱੱਾਦ ਜਾਪ ਆਦ ਸਾਚ ਜਗਾਦ ਸਾਚ ਹਿ ਸਾਚ ਨਾਨਕ ਸੀਬੀ ਸਾਚ ਸਚ਼ਿ ਸ਼ਿ",
+    ),
+    ("ਨਾਤ੍ਯਾਂ ਜਾਤ੍ਯ ਸਂਤਮਂ ਪਾਂ", "ਨਾਧਿਾਂ ਜਾਧਿ ਸੰਤਂ ਪਾ"),
+    ("ਸੇਖ  ਮਾਰੇ\tਤਾਰੀਆ ਚੁਂ ਚੁਂ ਚੁਂ", "ਸੇਵਕ ਤਾਰੀਐ ਚੁਂ"),
+    ("ਆਦਿ ਸਚੁ ... ਜੁਗਾਦਿ ਕ ਸਚੁ !!! ਸ ਤ", "ਆਦਿ ਸਚੁ ਜੁਗਾਦਿ ਸਚੁ ਸਤ"),
+    ("ਹੈ ਹੋ ਤੇ ਦੇ ਨੂੰ ਸਚੁ", "ਹੈ ਹੋ ਤੇ ਦੇ ਨੂੰ ਸਚੁ"),
+    ("ਪ ਰਮੇਸਰ ਗ ੁਰ ਆਆਆਆ", "ਰਮੇਸਰ ੁਰ"),
+    ("  ", ""),
+    ("", ""),
+]
+
+
+def test_clean_stt_output_matches_reference_outputs():
+    cleaner = WhisperTextCleaner()
+
+    for text, expected in EXPECTED:
+        assert cleaner.clean_stt_output(text) == expected
+
+
+def test_step_logging_does_not_change_output(caplog):
+    cleaner = WhisperTextCleaner(enable_logging=True)
+
+    with caplog.at_level(logging.DEBUG, logger="paathguide.text_cleaner"):
+        for text, expected in EXPECTED:
+            assert cleaner.clean_stt_output(text) == expected
+    assert any("5. Word Mappings" in record.message for record in caplog.records)
+
+
+def test_added_mappings_apply_on_next_call():
+    cleaner = WhisperTextCleaner()
+    assert cleaner.clean_stt_output("ਸਚੁ ਨਾਮੁ") == "ਸਚੁ ਨਾਮੁ"
+
+    cleaner.add_character_mapping("ਨਾਮੁ", "ਨਾਉ")
+    cleaner.add_word_mapping("ਸਚੁ ਨਾਉ", "ਸਤਿਨਾਮੁ")
+    assert cleaner.clean_stt_output("ਸਚੁ ਨਾਮੁ") == "ਸਤਿਨਾਮੁ"
+
+
+def test_stage_stats_count_time_and_rule_hits():
+    cleaner = WhisperTextCleaner(stats=CleaningStats())
+    assert WhisperTextCleaner().get_stage_stats() == {"enabled": False}
+
+    for text, expected in EXPECTED:
+        assert cleaner.clean_stt_output(text) == expected
+
+    stats = cleaner.get_stage_stats()
+    assert stats["texts"] == len(EXPECTED) - 1  # empty input returns before any step
+    assert [stage["stage"][:3] for stage in stats["stages"]] == ["1. ", "2. ", "3. ", "4. ", "5. ", "6. ", "7. ", "8. ", "9. ", "10.", "11."]
+    assert sum(stage["chars_removed"] for stage in stats["stages"]) == stats["chars_in"] - stats["chars_out"]
+    assert stats["mapping_hits"]["word"] == {"ਸੇਖ ਮਾਰੇ": 1, "ਤਾਰੀਆ ਚੁਂ": 1}
+    assert stats["mapping_hits"]["pattern"] == {"(ਸ਼ਿ\\s*){2,}": 1, "(ਚੁਂ\\s*){2,}": 1}
+    # Shadowed by the earlier "ਤ੍ਯ" mapping, so it can never match
+    assert "ਜਾਤ੍ਯ" in stats["unused_mappings"]["character"]
+
+
+def test_clean_many_keeps_input_order_across_workers():
+    cleaner = WhisperTextCleaner()
+    texts = [text for text, _ in EXPECTED] * 50
+
+    assert list(cleaner.clean_many(iter(texts), workers=2, chunk_size=7)) == [cleaner.clean_stt_output(text) for text in texts]
+
+
+def test_clean_text_command_streams_jsonl_and_tsv():
+    runner = CliRunner()
+    jsonl = "".join(json.dumps({"id": i, "text": text}, ensure_ascii=False) + "\n" for i, (text, _) in enumerate(EXPECTED[:3]))
+
+    result = runner.invoke(cli, ["clean-text", "-i", "-", "--format", "jsonl"], input=jsonl)
+    assert [json.loads(line)["cleaned"] for line in result.stdout.splitlines()] == [expected for _, expected in EXPECTED[:3]]
+
+    result = runner.invoke(cli, ["clean-text", "-i", "-", "--format", "tsv", "--column", "1"], input="7\tਹੈ ਹੋ ਤੇ ਦੇ ਨੂੰ ਸਚੁ\n")
+    assert result.stdout == "7\tਹੈ ਹੋ ਤੇ ਦੇ ਨੂੰ ਸਚੁ\tਹੈ ਹੋ ਤੇ ਦੇ ਨੂੰ ਸਚੁ\n"
+
+
+def test_incremental_cleaner_matches_full_clean_at_every_append():
+    cleaner = WhisperTextCleaner()
+    rng = random.Random(0)
+    words = " ".join(text for text, _ in EXPECTED).split(" ") + ["ਹੈ"] * 20
+    transcript = " ".join(rng.choice(words) for _ in range(300))
+
+    incremental = IncrementalTextCleaner(cleaner, margin_words=4)
+    position = 0
+    while position < len(transcript):
+        step = rng.randint(1, 15)  # chunks split words as well as joining them
+        cleaned = incremental.append(transcript[position : position + step])
+        position += step
+        assert cleaned == cleaner.clean_stt_output(transcript[:position])
+    # Only a short tail is still being re-cleaned
+    assert len(incremental._tail.split()) < 40
+
+
+if __name__ == "__main__":
+    test_clean_stt_output_matches_reference_outputs()
+    test_added_mappings_apply_on_next_call()
+    test_stage_stats_count_time_and_rule_hits()
+    test_clean_many_keeps_input_order_across_workers()
+    test_clean_text_command_streams_jsonl_and_tsv()
+    test_incremental_cleaner_matches_full_clean_at_every_append()
+    print("✅ Text cleaner tests passed")